@@ -0,0 +1,250 @@
+# benchmark_history.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from performance_tester import machine_fingerprint
+
+
+# Fingerprint fields that identify the hardware. OS / driver updates keep the same baseline.
+HARDWARE_KEYS = ("cpu", "cores", "ram_mb", "disk_gb", "machine")
+
+
+def default_history_path() -> str:
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "SystemOptimizer", "benchmark_history.db")
+
+
+def machine_id(fingerprint: dict) -> str:
+    """Short stable id for the hardware part of a fingerprint."""
+    hardware = {key: fingerprint.get(key) for key in HARDWARE_KEYS}
+    return hashlib.sha256(json.dumps(hardware, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _median(values: list[float]) -> float:
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+class BenchmarkHistory:
+    """
+    Local SQLite store of PerformanceTester.run_all results.
+    Each run is saved with the machine fingerprint, the PerformanceTester.settings() that produced it
+    and a timestamp; sub-scores can be queried as trends and compared with a rolling baseline of runs
+    with the same settings to catch machines that degrade over weeks.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or default_history_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS machines (
+                    id TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    first_seen REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    machine_id TEXT NOT NULL REFERENCES machines(id),
+                    timestamp REAL NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    final REAL,
+                    settings TEXT
+                );
+                CREATE TABLE IF NOT EXISTS scores (
+                    run_id INTEGER NOT NULL REFERENCES runs(id),
+                    metric TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    detail TEXT,
+                    PRIMARY KEY (run_id, metric)
+                );
+                CREATE INDEX IF NOT EXISTS runs_machine_time ON runs(machine_id, timestamp);
+            """)
+            # databases created before runs stored their settings
+            if "settings" not in [row[1] for row in conn.execute("PRAGMA table_info(runs)")]:
+                conn.execute("ALTER TABLE runs ADD COLUMN settings TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        # one short-lived connection per call keeps the store safe to use from worker threads
+        return sqlite3.connect(self.path, timeout=10)
+
+    def record(self, results: dict, fingerprint: dict | None = None, timestamp: float | None = None,
+               settings: dict | None = None) -> int:
+        """Stores a run_all results dict and the PerformanceTester.settings() of the run; returns the run id."""
+        fingerprint = fingerprint or machine_fingerprint()
+        timestamp = timestamp or time.time()
+        mid = machine_id(fingerprint)
+        fp_json = json.dumps(fingerprint, sort_keys=True)
+        settings_json = json.dumps(settings, sort_keys=True, default=str) if settings is not None else None
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR IGNORE INTO machines (id, fingerprint, first_seen) VALUES (?, ?, ?)",
+                         (mid, fp_json, timestamp))
+            cursor = conn.execute(
+                "INSERT INTO runs (machine_id, timestamp, fingerprint, final, settings) VALUES (?, ?, ?, ?, ?)",
+                (mid, timestamp, fp_json, results.get("Final"), settings_json)
+            )
+            run_id = cursor.lastrowid
+
+            conn.executemany(
+                "INSERT INTO scores (run_id, metric, score, detail) VALUES (?, ?, ?, ?)",
+                [(run_id, metric, value[0], value[1]) for metric, value in results.items()
+                 if isinstance(value, tuple)]
+            )
+
+        return run_id
+
+    def metrics(self, machine: str | None = None) -> list[str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT s.metric FROM scores s JOIN runs r ON r.id = s.run_id "
+                "WHERE (? IS NULL OR r.machine_id = ?) ORDER BY s.metric",
+                (machine, machine)
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def trend(self, metric: str, machine: str | None = None, since: float | None = None,
+              limit: int | None = None) -> list[tuple[float, float]]:
+        """(timestamp, score) pairs for one sub-score, oldest first. metric "Final" reads the final score."""
+        if machine is None:
+            machine = machine_id(machine_fingerprint())
+
+        if metric == "Final":
+            query = "SELECT timestamp, final FROM runs WHERE machine_id = ? AND timestamp >= ? AND final IS NOT NULL"
+            params = [machine, since or 0]
+        else:
+            query = ("SELECT r.timestamp, s.score FROM scores s JOIN runs r ON r.id = s.run_id "
+                     "WHERE r.machine_id = ? AND r.timestamp >= ? AND s.metric = ?")
+            params = [machine, since or 0, metric]
+
+        query += " ORDER BY timestamp DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return list(reversed(rows))
+
+    def detect_regressions(self, run_id: int, window: int = 10, min_runs: int = 3,
+                           noise_threshold: float = 0.10) -> list[dict]:
+        """
+        Compares every sub-score of `run_id` with the median of the previous `window` runs on
+        the same machine with the same settings (preset, options, BENCHMARK_VERSION). A drop is flagged when it exceeds both `noise_threshold` (relative)
+        and 3 scaled MADs of the baseline, so naturally noisy metrics need a bigger drop.
+        """
+        with closing(self._connect()) as conn:
+            run = conn.execute("SELECT machine_id, timestamp, settings FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if not run:
+                return []
+
+            mid, timestamp, settings = run
+            current = conn.execute("SELECT metric, score FROM scores WHERE run_id = ?", (run_id,)).fetchall()
+            previous = conn.execute(
+                "SELECT id FROM runs WHERE machine_id = ? AND timestamp < ? AND settings IS ? "
+                "ORDER BY timestamp DESC LIMIT ?",
+                (mid, timestamp, settings, window)
+            ).fetchall()
+            previous_ids = [row[0] for row in previous]
+
+            history = {}
+            if previous_ids:
+                marks = ",".join("?" * len(previous_ids))
+                for metric, score in conn.execute(
+                        f"SELECT metric, score FROM scores WHERE run_id IN ({marks})", previous_ids):
+                    history.setdefault(metric, []).append(score)
+
+        regressions = []
+
+        for metric, score in current:
+            past = history.get(metric, [])
+            if len(past) < min_runs:
+                continue
+
+            baseline = _median(past)
+            mad = _median([abs(value - baseline) for value in past]) * 1.4826
+            drop = baseline - score
+
+            if baseline > 0 and drop > noise_threshold * baseline and drop > 3 * mad:
+                regressions.append({
+                    "metric": metric,
+                    "score": score,
+                    "baseline": round(baseline, 2),
+                    "drop_pct": round(drop / baseline * 100, 1),
+                })
+
+        return regressions
+
+
+class ResultCache:
+    """
+    Recent run_all results keyed by the full machine fingerprint (hardware, OS build, GPU driver)
+    plus PerformanceTester.settings() (preset, options, BENCHMARK_VERSION). A repeat request within
+    `ttl` seconds returns the stored results; any fingerprint or settings change misses, and stale
+    entries for other fingerprints are dropped on the next store.
+    Lives in the history database.
+    """
+
+    def __init__(self, path: str | None = None, ttl: float = 3600.0) -> None:
+        self.path = path or default_history_path()
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS result_cache (
+                    key TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    timestamp REAL NOT NULL,
+                    results TEXT NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def key(fingerprint: dict, settings: dict) -> str:
+        payload = json.dumps({"fingerprint": fingerprint, "settings": settings}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, settings: dict, fingerprint: dict | None = None, now: float | None = None) -> dict | None:
+        """Cached results (with "Cached" = age in seconds) or None when missing or older than ttl."""
+        fingerprint = fingerprint or machine_fingerprint()
+        now = now or time.time()
+
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT timestamp, results FROM result_cache WHERE key = ?",
+                               (self.key(fingerprint, settings),)).fetchone()
+
+        if not row or now - row[0] > self.ttl:
+            return None
+
+        # JSON turns the (score, detail) tuples into lists; restore them
+        results = {metric: tuple(value) if isinstance(value, list) else value
+                   for metric, value in json.loads(row[1]).items()}
+        results["Cached"] = round(now - row[0], 1)
+        return results
+
+    def put(self, results: dict, settings: dict, fingerprint: dict | None = None,
+            timestamp: float | None = None) -> None:
+        fingerprint = fingerprint or machine_fingerprint()
+        fp_json = json.dumps(fingerprint, sort_keys=True)
+
+        with closing(self._connect()) as conn, conn:
+            # entries for another fingerprint (RAM upgrade, driver or OS update) can never hit again
+            conn.execute("DELETE FROM result_cache WHERE fingerprint != ?", (fp_json,))
+            conn.execute("INSERT OR REPLACE INTO result_cache (key, fingerprint, timestamp, results) VALUES (?, ?, ?, ?)",
+                         (self.key(fingerprint, settings), fp_json, timestamp or time.time(), json.dumps(results)))
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM result_cache")
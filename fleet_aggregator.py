@@ -0,0 +1,200 @@
+# fleet_aggregator.py
+"""
+Aggregates a directory of `performance_tester.py --json` exports from many machines:
+per-metric percentiles, per-hardware-class distributions and outliers.
+
+    python fleet_aggregator.py results/ [--json report.json] [--threshold 3.5]
+
+Files are parsed one at a time into flat numeric columns (documents are not kept), and all
+statistics are computed on those columns with NumPy.
+"""
+import argparse
+import json
+import os
+import sys
+from array import array
+
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads
+except Exception:
+    _loads = json.loads
+
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def hardware_class(fingerprint: dict) -> str:
+    """Coarse hardware bucket: CPU model, core count and RAM rounded to the nearest power of two GB."""
+    ram_gb = max(fingerprint.get("ram_mb", 0) / 1024, 1)
+    ram_class = 2 ** round(np.log2(ram_gb))
+    return f"{fingerprint.get('cpu', '?')} | {fingerprint.get('cores', '?')}c | {ram_class}GB"
+
+
+class _Columns:
+    """Streaming column store: one (value, row) pair per metric per file, plus per-row metadata."""
+
+    def __init__(self) -> None:
+        self.files = []
+        self.classes = {}
+        self.row_class = array("q")
+        self.metrics = {}  # metric -> (array of values, array of row indices)
+        self.errors = 0
+
+    def add(self, path: str, document: dict) -> None:
+        row = len(self.files)
+        name = hardware_class(document.get("fingerprint") or {})
+        self.files.append(path)
+        self.row_class.append(self.classes.setdefault(name, len(self.classes)))
+
+        for metric, value in (document.get("results") or {}).items():
+            if isinstance(value, dict):
+                value = value.get("score")
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values, rows = self.metrics.setdefault(metric, (array("d"), array("q")))
+                values.append(value)
+                rows.append(row)
+
+
+def _iter_documents(directory: str):
+    """Yields (path, document) for every *.json file under directory, one file in memory at a time."""
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(".json"):
+                path = os.path.join(root, name)
+                try:
+                    with open(path, "rb") as f:
+                        yield path, _loads(f.read())
+                except (OSError, ValueError):
+                    yield path, None
+
+
+def _group_stats(values: np.ndarray, groups: np.ndarray, n_groups: int):
+    """
+    Per-group count, percentiles and median / MAD without a Python loop over rows:
+    sort by (group, value) once and index into each group's slice.
+    """
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+
+    def quantile(q: float) -> np.ndarray:
+        # linear interpolation between closest ranks, like np.percentile
+        pos = starts + q * np.maximum(counts - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, starts + np.maximum(counts - 1, 0))
+        frac = pos - lo
+        out = np.full(n_groups, np.nan)
+        out[present] = ordered[lo[present]] * (1 - frac[present]) + ordered[hi[present]] * frac[present]
+        return out
+
+    medians = quantile(0.5)
+    deviations = np.abs(values - medians[groups])
+    dev_order = np.lexsort((deviations, groups))
+    dev_ordered = deviations[dev_order]
+    mid_lo = starts + (np.maximum(counts - 1, 0)) // 2
+    mid_hi = starts + np.maximum(counts, 1) // 2
+    mad = np.full(n_groups, np.nan)
+    mad[present] = (dev_ordered[mid_lo[present]] + dev_ordered[np.minimum(mid_hi, starts + counts - 1)[present]]) / 2
+
+    return counts, {q: quantile(q / 100) for q in PERCENTILES}, medians, mad
+
+
+def aggregate(directory: str, threshold: float = 3.5, min_class_size: int = 5) -> dict:
+    """
+    Reads every export under `directory` and returns:
+      metrics: fleet-wide count / mean / percentiles per metric
+      classes: per hardware class, count and percentiles per metric
+      outliers: results whose robust z-score within their hardware class exceeds `threshold`
+                (|x - median| / (1.4826 * MAD)); classes smaller than min_class_size are skipped
+    """
+    columns = _Columns()
+
+    for path, document in _iter_documents(directory):
+        if document is None:
+            columns.errors += 1
+        else:
+            columns.add(path, document)
+
+    class_names = sorted(columns.classes, key=columns.classes.get)
+    row_class = np.frombuffer(columns.row_class, dtype=np.int64) if columns.row_class else np.zeros(0, np.int64)
+    report = {"files": len(columns.files), "unreadable": columns.errors, "metrics": {},
+              "classes": {name: {"count": int(n)} for name, n in
+                          zip(class_names, np.bincount(row_class, minlength=len(class_names)))},
+              "outliers": []}
+
+    for metric, (values, rows) in sorted(columns.metrics.items()):
+        values = np.frombuffer(values, dtype=np.float64)
+        rows = np.frombuffer(rows, dtype=np.int64)
+
+        report["metrics"][metric] = {
+            "count": int(values.size),
+            "mean": round(float(values.mean()), 3),
+            **{f"p{q}": round(float(v), 3) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+        }
+
+        groups = row_class[rows]
+        counts, percentiles, medians, mad = _group_stats(values, groups, len(class_names))
+
+        for index in np.flatnonzero(counts):
+            report["classes"][class_names[index]][metric] = {
+                "count": int(counts[index]),
+                **{f"p{q}": round(float(percentiles[q][index]), 3) for q in PERCENTILES},
+            }
+
+        # robust z within the hardware class; a zero MAD (identical scores) flags nothing
+        scale = 1.4826 * mad[groups]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where(scale > 0, (values - medians[groups]) / scale, 0.0)
+        flagged = np.flatnonzero((np.abs(z) > threshold) & (counts[groups] >= min_class_size))
+
+        for i in flagged:
+            report["outliers"].append({
+                "file": columns.files[rows[i]],
+                "class": class_names[groups[i]],
+                "metric": metric,
+                "score": float(values[i]),
+                "class_median": round(float(medians[groups[i]]), 3),
+                "z": round(float(z[i]), 2),
+            })
+
+    report["outliers"].sort(key=lambda o: -abs(o["z"]))
+    return report
+
+
+def _print_report(report: dict, top: int) -> None:
+    print(f"{report['files']} result files ({report['unreadable']} unreadable), "
+          f"{len(report['classes'])} hardware classes")
+
+    print(f"\n{'metric':<24}{'n':>8}" + "".join(f"{f'p{q}':>8}" for q in PERCENTILES))
+    for metric, stats in report["metrics"].items():
+        print(f"{metric:<24}{stats['count']:>8}" + "".join(f"{stats[f'p{q}']:>8.2f}" for q in PERCENTILES))
+
+    print(f"\nOutliers (top {top} of {len(report['outliers'])}):")
+    for o in report["outliers"][:top]:
+        print(f"  {o['metric']}: {o['score']:.2f} vs {o['class_median']:.2f} (z={o['z']:+.1f}) "
+              f"[{o['class']}] {o['file']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate performance_tester JSON exports")
+    parser.add_argument("directory")
+    parser.add_argument("--json", metavar="PATH", help="write the full report as JSON to PATH ('-' = stdout)")
+    parser.add_argument("--threshold", type=float, default=3.5, help="robust z-score for outliers")
+    parser.add_argument("--min-class", type=int, default=5, help="smallest hardware class checked for outliers")
+    parser.add_argument("--top", type=int, default=20, help="outliers shown in the text report")
+    args = parser.parse_args()
+
+    report = aggregate(args.directory, args.threshold, args.min_class)
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        _print_report(report, args.top)
@@ -116,10 +116,20 @@ class Window:
              lambda: self.run_with_overlay(
                  "Running Performance Test",
                  "Benchmarking CPU, RAM, Disk and GPU...",
-                 self.actions.pc_performance_test
+                 self.actions.pc_performance_test,
+                 progress=True
              ),
              "#ff6b6b"),
 
+            ("Re-run Performance Test",
+             lambda: self.run_with_overlay(
+                 "Running Performance Test",
+                 "Ignoring cached results, benchmarking again...",
+                 lambda on_progress: self.actions.pc_performance_test(on_progress, force_refresh=True),
+                 progress=True
+             ),
+             "#c0392b"),
+
             ("Create Restore Point",
              lambda: self.run_with_overlay(
                  "Creating Restore Point",
@@ -369,16 +379,32 @@ class Window:
 
         action()
 
-    def run_with_overlay(self, title: str, message: str, task: Callable[[], None]) -> None:
+    def run_with_overlay(self, title: str, message: str, task: Callable[..., None], progress: bool = False) -> None:
+        """
+        Runs task in a worker thread behind the overlay.
+        With progress=True the task is called with an on_progress(event) callback that shows
+        live benchmark events (phase, throughput, percent) in the overlay status line.
+        """
 
         overlay = ProgressOverlay(self.root, title=title, message=message, slide=False)
 
+        def on_progress(event: dict) -> None:
+            text = f"{event['phase']} ({event['percent']:.0f}%)"
+            if event["value"] is not None:
+                text = f"{event['phase']}: {event['value']:.1f} {event['unit']} ({event['percent']:.0f}%)"
+
+            # Tk widgets must be updated from the main loop
+            self.root.after(0, overlay.update_status, text)
+
         def worker():
             try:
                 if hasattr(self, "log_panel"):
                     self.log_panel.info(f"▶️ {title}")
 
-                task()
+                if progress:
+                    task(on_progress)
+                else:
+                    task()
 
                 overlay.update_status("Done")
                 time.sleep(0.6)
@@ -730,4 +756,6 @@ class Spinner(tk.Label):
             return
 
 
-window = Window()
\ No newline at end of file
+# Guarded so benchmark worker processes (spawn) can import this module without opening the GUI
+if __name__ == "__main__":
+    window = Window()
\ No newline at end of file
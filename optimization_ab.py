@@ -0,0 +1,279 @@
+# optimization_ab.py
+import itertools
+import os
+import random
+import time
+
+from performance_tester import (PRESETS, BenchmarkCancelled, ProgressReporter, _percentile, reporting,
+                                run_cpu_benchmark, run_cpu_scaling_benchmark, run_ram_benchmark,
+                                run_ram_latency_benchmark, run_disk_benchmark, run_commit_latency_benchmark,
+                                run_gpu_benchmark, run_workload_benchmark)
+
+
+# ---------- Benchmark subsets ----------
+# name -> fn(preset, log_panel) -> {metric: (score, detail)}; metric names match PerformanceTester results.
+# The A/B statistics use the raw medians the benchmarks report as progress events, not these scores.
+def _ab_cpu_scaling(preset: dict, log_panel) -> dict:
+    cores = os.cpu_count() or 1
+    scaling = run_cpu_scaling_benchmark(log_panel=log_panel, measure=preset["measure"], target=preset["target"],
+                                        worker_counts=sorted({1, cores}))
+    return {"CPU Single-core": scaling["single_core"], "CPU All-core": scaling["all_core"]}
+
+
+AB_BENCHMARKS = {
+    "cpu": lambda preset, log_panel: {
+        "CPU": run_cpu_benchmark(log_panel=log_panel, measure=preset["measure"], target=preset["target"])},
+    "cpu_scaling": _ab_cpu_scaling,
+    "ram": lambda preset, log_panel: {
+        "RAM": run_ram_benchmark(preset["ram_mb"], log_panel=log_panel, measure=preset["measure"],
+                                 target=preset["target"])},
+    "ram_latency": lambda preset, log_panel: {
+        "RAM Latency": run_ram_latency_benchmark(preset["latency_mb"], log_panel=log_panel,
+                                                 measure=preset["measure"], target=preset["target"])},
+    "disk": lambda preset, log_panel: {
+        "Disk": run_disk_benchmark(preset["disk_mb"], log_panel=log_panel, measure=preset["measure"],
+                                   target=preset["disk_target"], queue_depths=preset["queue_depths"],
+                                   io_window=preset["io_window"])},
+    "commit": lambda preset, log_panel: {
+        "Disk Commit Latency": run_commit_latency_benchmark(time_budget=preset["commit_budget"],
+                                                            log_panel=log_panel)},
+    "application": lambda preset, log_panel: {
+        "Application": run_workload_benchmark(log_panel=log_panel, measure=preset["measure"],
+                                              target=preset["target"])["score"]},
+    "gpu": lambda preset, log_panel: {
+        "GPU": run_gpu_benchmark(duration=preset["gpu_duration"], log_panel=log_panel, measure=preset["measure"])},
+}
+
+DEFAULT_AB_BENCHMARKS = ("cpu", "cpu_scaling", "ram", "ram_latency")
+
+# raw units where a smaller value is an improvement
+LOWER_IS_BETTER_UNITS = ("ns/step", "ns/page", "ns/alloc", "us")
+
+
+# ---------- Optimization actions ----------
+# name -> fn(actions) that applies the optimization and returns a callable restoring the previous state
+def _ab_power_plan(actions):
+    previous = actions.get_active_power_plan()
+    if not previous:
+        raise RuntimeError("Could not read the active power plan")
+
+    actions.enable_high_power_plan()
+    return lambda: actions.set_power_plan(previous)
+
+
+def _ab_background_apps(actions):
+    was_disabled = actions.background_apps_disabled()
+    actions.disable_background_apps()
+    return lambda: None if was_disabled else actions.enable_background_apps()
+
+
+def _ab_service(service_name: str):
+    def apply(actions):
+        # "disable" also sets the start type to Disabled, so both the status and the start type are restored
+        status = actions._check_service_status(service_name)
+        start_type = actions.get_service_start_type(service_name)
+        if not status or not start_type:
+            raise RuntimeError(f"Could not read the state of {service_name}")
+
+        actions.set_service_state(service_name, "disable")
+        return lambda: actions.restore_service(service_name, start_type, status)
+
+    return apply
+
+
+AB_ACTIONS = {
+    "high_power_plan": _ab_power_plan,
+    "disable_background_apps": _ab_background_apps,
+    "disable_sysmain": _ab_service("SysMain"),
+}
+
+
+# ---------- Statistics ----------
+def _paired_p_value(diffs: list[float], resamples: int = 20_000) -> float:
+    """
+    Two-sided sign-flip permutation test of mean(diffs) == 0. Exact up to 14 pairs, Monte Carlo above.
+    With n pairs the smallest attainable p is 2 / 2**n, so at least 6 rounds are needed to reach p < 0.05.
+    """
+    n = len(diffs)
+    if n == 0:
+        return 1.0
+
+    observed = abs(sum(diffs))
+    if observed == 0:
+        return 1.0
+
+    if n <= 14:
+        signs = itertools.product((1, -1), repeat=n)
+        total = 2 ** n
+    else:
+        rng = random.Random(0)
+        signs = ([rng.choice((1, -1)) for _ in range(n)] for _ in range(resamples))
+        total = resamples
+
+    extreme = sum(1 for flip in signs if abs(sum(s * d for s, d in zip(flip, diffs))) >= observed - 1e-12)
+    return extreme / total
+
+
+def _delta(a: list[float], b: list[float]) -> dict:
+    diffs = [after - before for before, after in zip(a, b)]
+    mean_a = sum(a) / len(a)
+    delta = sum(diffs) / len(diffs)
+
+    return {
+        "before": a,
+        "after": b,
+        "delta": round(delta, 3),
+        "delta_pct": round(delta / mean_a * 100, 1) if mean_a else 0.0,
+    }
+
+
+def _ab_stats(a: list[float], b: list[float], alpha: float, lower_is_better: bool = False) -> dict:
+    p_value = _paired_p_value([after - before for before, after in zip(a, b)])
+
+    return {
+        **_delta(a, b),
+        "lower_is_better": lower_is_better,
+        "p_value": round(p_value, 4),
+        "significant": p_value < alpha,
+    }
+
+
+# ---------- Harness ----------
+def run_ab_test(actions, action, benchmarks=DEFAULT_AB_BENCHMARKS, rounds: int = 6, settle: float = 10.0,
+                revert: bool = True, preset: str = "standard", alpha: float = 0.05, log_panel=None,
+                on_progress=None, reporter: ProgressReporter | None = None) -> dict:
+    """
+    Measures `benchmarks` with the optimization off (A) and on (B) over `rounds` paired rounds.
+    Rounds alternate A->B and B->A (ABBA), so the action toggles once per round and slow drift
+    (thermals, background load) hits both sides equally. After each toggle the system settles
+    for `settle` seconds.
+
+    "metrics" holds the raw medians of every measured phase, e.g. "CPU matmul (GFLOPS)",
+    "RAM latency (ns/step)" or "DISK commit (commits/s)", and their paired sign-flip permutation
+    test. The 0-10 scores are clamped and rounded, so a metric at 10 can't improve; their deltas are
+    only reported under "scores".
+
+    `action` is an AB_ACTIONS name or a fn(actions) -> revert callable. With revert=True the
+    machine is left in its original state and re-measured once more ("reverted"); with
+    revert=False it is left optimized. A cancelled or failed run always reverts.
+    """
+    apply = AB_ACTIONS[action] if isinstance(action, str) else action
+    name = action if isinstance(action, str) else getattr(action, "__name__", "custom")
+    preset = PRESETS[preset]
+    reporter = reporter or ProgressReporter(on_progress)
+    steps = rounds * 2 + 1
+
+    samples = {"A": {}, "B": {}}
+    score_samples = {"A": {}, "B": {}}
+    state = {"undo": None, "finished": False}
+    result = {"action": name, "rounds": rounds, "benchmarks": list(benchmarks), "metrics": {}, "scores": {},
+              "reverted": None, "cancelled": False}
+
+    def toggle(to: str) -> None:
+        if to == "B":
+            state["undo"] = apply(actions)
+        else:
+            state["undo"]()
+            state["undo"] = None
+
+        deadline = time.perf_counter() + settle
+        while time.perf_counter() < deadline:
+            reporter.check()
+            time.sleep(min(0.25, settle))
+
+    def measure(step: int, label: str) -> tuple[dict, dict]:
+        """Runs the subset once; returns ({"phase (unit)": raw median}, {metric: score})."""
+        reporter.begin(step, steps, f"A/B {label}")
+        scores, phase_samples = {}, {}
+        forward = reporter.callback
+
+        def collect(event: dict) -> None:
+            if event["value"] is not None and event["sample"]:
+                phase_samples.setdefault(f"{event['phase']} ({event['unit']})", []).append(event["value"])
+            if forward:
+                forward(event)
+
+        reporter.callback = collect
+        try:
+            for bench in benchmarks:
+                scores.update({metric: score for metric, (score, _) in AB_BENCHMARKS[bench](preset, log_panel).items()})
+        finally:
+            reporter.callback = forward
+
+        return {metric: _percentile(sorted(values), 50) for metric, values in phase_samples.items()}, scores
+
+    with reporting(reporter):
+        try:
+            step = 0
+            for round_index in range(rounds):
+                order = ("A", "B") if round_index % 2 == 0 else ("B", "A")
+
+                for side in order:
+                    if (side == "B") != (state["undo"] is not None):
+                        toggle(side)
+
+                    raw, scores = measure(step, f"round {round_index + 1} {side}")
+                    for metric, value in raw.items():
+                        samples[side].setdefault(metric, []).append(value)
+                    for metric, score in scores.items():
+                        score_samples[side].setdefault(metric, []).append(score)
+                    step += 1
+
+            if revert:
+                if state["undo"] is not None:
+                    toggle("A")
+                result["reverted"] = measure(step, "reverted")[0]
+            elif state["undo"] is None:
+                toggle("B")
+
+            state["finished"] = True
+
+        except BenchmarkCancelled:
+            result["cancelled"] = True
+
+        finally:
+            # never leave a half-finished experiment applied unless asked to keep it
+            if state["undo"] is not None and (revert or not state["finished"]):
+                state["undo"]()
+
+    for metric, before in samples["A"].items():
+        after = samples["B"].get(metric, [])
+        pairs = min(len(before), len(after))
+        if pairs:
+            lower_is_better = metric.endswith(tuple(f"({unit})" for unit in LOWER_IS_BETTER_UNITS))
+            result["metrics"][metric] = _ab_stats(before[:pairs], after[:pairs], alpha, lower_is_better)
+
+    for metric, before in score_samples["A"].items():
+        after = score_samples["B"].get(metric, [])
+        pairs = min(len(before), len(after))
+        if pairs:
+            result["scores"][metric] = _delta(before[:pairs], after[:pairs])
+
+    return result
+
+
+def ab_report(result: dict) -> str:
+    """Human-readable before/after table for a run_ab_test result."""
+    lines = [f"A/B: {result['action']} ({result['rounds']} rounds)"
+             + (" — cancelled" if result["cancelled"] else "")]
+
+    for metric, stats in result["metrics"].items():
+        before = sum(stats["before"]) / len(stats["before"])
+        after = sum(stats["after"]) / len(stats["after"])
+        if not stats["significant"]:
+            verdict = "not significant"
+        else:
+            better = (stats["delta"] < 0) == stats["lower_is_better"]
+            verdict = "significant, " + ("better" if better else "worse")
+        lines.append(f"  {metric}: {before:.2f} → {after:.2f} ({stats['delta_pct']:+.1f}%, "
+                     f"p={stats['p_value']:.3f}, {verdict})")
+
+    if result["scores"]:
+        lines.append("  scores: " + ", ".join(f"{metric} {stats['delta']:+.2f}"
+                                              for metric, stats in result["scores"].items()))
+
+    if result["reverted"]:
+        lines.append("  after revert: " + ", ".join(f"{metric} {value:.2f}"
+                                                    for metric, value in result["reverted"].items()))
+
+    return "\n".join(lines)
@@ -1,10 +1,29 @@
 # benchmarks.py
+import contextlib
+import functools
+import hashlib
+import json
+import lzma
 import math
+import mmap
+import multiprocessing
 import os
+import platform
+import queue
 import threading
 import time
+import random
+import re
 import shutil
+import socket
+import sqlite3
+import struct
+import subprocess
 import tempfile
+import tracemalloc
+import zlib
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
 # Optional libs
 try:
@@ -20,8 +39,23 @@ try:
 except Exception:
     _HAS_GL = False
 
+try:
+    import psutil
+    _HAS_PSUTIL = True
+except Exception:
+    _HAS_PSUTIL = False
+
+try:
+    from PIL import Image
+    _HAS_PIL = True
+except Exception:
+    _HAS_PIL = False
+
 
 #  Helpers
+_MB = 1024 * 1024
+
+
 def _safe_log(log_panel, msg):
     if log_panel:
         try:
@@ -44,20 +78,494 @@ def _normalize(value, ref_min, ref_max) -> float:
     return round((value - ref_min) / (ref_max - ref_min) * 10.0, 2)
 
 
+# ---------- Progress events ----------
+class BenchmarkCancelled(BaseException):
+    """
+    Raised inside a running benchmark once its consumer cancels it.
+    BaseException so the benchmarks' generic `except Exception` handlers don't swallow it.
+    """
+
+
+class ProgressReporter:
+    """
+    Receives structured progress events from running benchmarks and carries the cancel flag.
+    Events are dicts: {"benchmark", "phase", "percent", "value", "unit", "sample"}, where
+    percent covers the whole run (steps set by begin()) and value is the latest sample
+    (MB/s, GFLOPS, FPS, IOPS...).
+    """
+
+    def __init__(self, callback=None) -> None:
+        self.callback = callback
+        self.cancelled = threading.Event()
+        self.benchmark = ""
+        self.step = 0
+        self.steps = 1
+        self._fraction = 0.0
+
+    def begin(self, step: int, steps: int, benchmark: str) -> None:
+        self.step, self.steps, self.benchmark = step, steps, benchmark
+        self._fraction = 0.0
+        self.emit(benchmark, 0.0)
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def check(self) -> None:
+        if self.cancelled.is_set():
+            raise BenchmarkCancelled(self.benchmark)
+
+    def emit(self, phase: str, fraction: float, value: float | None = None, unit: str = "", sample: int = 0) -> None:
+        if not self.callback:
+            return
+
+        # a benchmark may run several measurements; keep its share of the bar monotonic
+        self._fraction = max(self._fraction, min(max(fraction, 0.0), 1.0))
+        percent = (self.step + self._fraction) / max(self.steps, 1) * 100.0
+
+        try:
+            self.callback({
+                "benchmark": self.benchmark,
+                "phase": phase,
+                "percent": round(percent, 1),
+                "value": value,
+                "unit": unit,
+                "sample": sample,
+            })
+        except Exception:
+            pass
+
+
+_progress = threading.local()
+
+
+def _reporter() -> ProgressReporter | None:
+    return getattr(_progress, "reporter", None)
+
+
+@contextlib.contextmanager
+def reporting(reporter: ProgressReporter | None):
+    """Routes progress events / cancellation of benchmarks run in this thread to `reporter`."""
+    previous = _reporter()
+    _progress.reporter = reporter
+
+    try:
+        yield reporter
+    finally:
+        _progress.reporter = previous
+
+
+def _checkpoint() -> None:
+    """Cancellation point for long loops that don't go through _measure()."""
+    reporter = _reporter()
+    if reporter:
+        reporter.check()
+
+
+# ---------- Measurement harness ----------
+# Defaults for _measure(); every benchmark accepts a `measure` dict that overrides them.
+MEASURE_DEFAULTS = {
+    "warmup": 1,             # untimed iterations before sampling
+    "min_repeats": 5,        # samples required before the confidence target is checked
+    "max_repeats": 30,       # hard cap on samples
+    "time_budget": 3.0,      # seconds; sampling stops once exceeded (after >= 2 samples)
+    "ci_target": 0.02,       # stop when the 95% CI of the median is within ±2% of it
+    "noise_threshold": 0.10, # flag as noisy when (p95 - p5) / median exceeds this
+}
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile (q in 0..100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, len(sorted_values) - 1)
+
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _median_ci(sorted_values: list[float]) -> tuple[float, float]:
+    """Distribution-free 95% confidence interval of the median (order statistics)."""
+    n = len(sorted_values)
+    half = 1.96 * math.sqrt(n) / 2
+    lo = max(0, int(math.floor(n / 2 - half)) - 1)
+    hi = min(n - 1, int(math.ceil(1 + n / 2 + half)) - 1)
+
+    return sorted_values[lo], sorted_values[hi]
+
+
+def _summarize(samples: list[float], noise_threshold: float = MEASURE_DEFAULTS["noise_threshold"]) -> dict:
+    """Median, p5/p95 and median CI of a list of samples."""
+    values = sorted(samples)
+    median = _percentile(values, 50)
+    ci_low, ci_high = _median_ci(values) if values else (0.0, 0.0)
+    p5, p95 = _percentile(values, 5), _percentile(values, 95)
+
+    spread = (p95 - p5) / median if median else 0.0
+    ci_rel = (ci_high - ci_low) / 2 / median if median else 0.0
+
+    return {
+        "median": median,
+        "p5": p5,
+        "p95": p95,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "ci_rel": ci_rel,
+        "samples": len(values),
+        "noisy": len(values) < 2 or spread > noise_threshold,
+    }
+
+
+def _measure(sample_fn, measure: dict | None = None, phase: str = "", unit: str = "") -> dict:
+    """
+    Calls sample_fn() repeatedly; each call returns one sample (e.g. MB/s, GFLOPS, FPS).
+    Runs `warmup` untimed calls, then samples until the median CI reaches `ci_target`,
+    the `time_budget` is spent or `max_repeats` is hit. Returns _summarize() stats.
+    Every sample is reported as a `phase` progress event and is a cancellation point.
+    """
+    opts = {**MEASURE_DEFAULTS, **(measure or {})}
+    reporter = _reporter()
+
+    for _ in range(opts["warmup"]):
+        if reporter:
+            reporter.check()
+        sample_fn()
+
+    samples = []
+    start = time.perf_counter()
+
+    while len(samples) < opts["max_repeats"]:
+        if reporter:
+            reporter.check()
+
+        samples.append(sample_fn())
+
+        n = len(samples)
+        elapsed = time.perf_counter() - start
+
+        if reporter:
+            fraction = max(n / opts["max_repeats"], elapsed / opts["time_budget"])
+            reporter.emit(phase, fraction, samples[-1], unit, n)
+
+        if n >= 2 and elapsed >= opts["time_budget"]:
+            break
+
+        if n >= opts["min_repeats"]:
+            if _summarize(samples)["ci_rel"] <= opts["ci_target"]:
+                break
+
+    stats = _summarize(samples, opts["noise_threshold"])
+    stats["noisy"] = stats["noisy"] or stats["ci_rel"] > opts["ci_target"]
+
+    return stats
+
+
+def _calibrate(probe, size: int, target: float, min_size: int, max_size: int, exponent: float = 1.0) -> int:
+    """
+    Picks a problem size so one run takes about `target` seconds.
+    probe(size) runs the kernel once and returns its duration. The size doubles until a run is
+    long enough to time (>= target / 10), then is extrapolated assuming duration ∝ size ** exponent.
+    """
+    size = max(min_size, min(size, max_size))
+
+    while True:
+        elapsed = probe(size)
+        if elapsed >= target / 10 or size >= max_size:
+            break
+        size = min(max_size, size * 2)
+
+    if elapsed <= 0:
+        return max_size
+
+    scaled = size * (target / elapsed) ** (1.0 / exponent)
+    return int(min(max_size, max(min_size, scaled)))
+
+
+def _stats_detail(stats: dict, unit: str) -> str:
+    """Human-readable summary: median, p5/p95, CI and a noisy flag."""
+    detail = (f"{stats['median']:.2f} {unit} median (p5 {stats['p5']:.2f} / p95 {stats['p95']:.2f}, "
+              f"CI ±{stats['ci_rel']:.1%}, n={stats['samples']})")
+
+    if stats["noisy"]:
+        detail += " ⚠️ noisy"
+
+    return detail
+
+
+# ---------- Memory budget ----------
+# Share of the currently available physical memory one benchmark may use when no explicit budget
+# is set, so the suite never pushes a small machine into swap.
+MEMORY_BUDGET_FRACTION = 0.5
+
+_memory = threading.local()
+
+
+def _available_memory() -> int | None:
+    """Bytes of physical memory available without paging, None when unknown."""
+    if _HAS_PSUTIL:
+        try:
+            return psutil.virtual_memory().available
+        except Exception:
+            pass
+
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return None
+
+
+def _memory_budget() -> int | None:
+    """Bytes one benchmark may allocate: the active memory_budget() capped at a share of available memory."""
+    available = _available_memory()
+    limits = [limit for limit in (getattr(_memory, "budget", None),
+                                  available and int(available * MEMORY_BUDGET_FRACTION)) if limit]
+    return min(limits) if limits else None
+
+
+@contextlib.contextmanager
+def memory_budget(mb: int | None):
+    """
+    Caps the working sets of benchmarks run in this thread at `mb` MB (None = only the available
+    memory share) and collects the peak they declare.
+    """
+    previous = getattr(_memory, "budget", None), getattr(_memory, "declared", None)
+    _memory.budget, _memory.declared = (mb * _MB if mb else None), None
+
+    try:
+        yield
+    finally:
+        _memory.budget, _memory.declared = previous
+
+
+def _fit_memory(size: int, peak_bytes, min_size: int, log_panel=None, what: str = "") -> int:
+    """
+    Shrinks `size` until peak_bytes(size), the benchmark's declared peak allocation, fits the memory
+    budget (never below min_size) and records that peak. Returns the size to use.
+    5% of the budget is left for interpreter and allocator overhead the declaration doesn't count.
+    """
+    budget = _memory_budget()
+    fitted = size
+
+    if budget:
+        while fitted > min_size and peak_bytes(fitted) > budget * 0.95:
+            fitted = max(min_size, int(fitted * 0.9))
+
+    if fitted < size:
+        _safe_log(log_panel, f"{what}: size capped at {fitted} (was {size}) "
+                             f"to fit the {budget // _MB} MB memory budget")
+
+    _memory.declared = max(getattr(_memory, "declared", None) or 0, peak_bytes(fitted))
+    return fitted
+
+
+def _rss() -> int | None:
+    """Resident set size of this process in bytes, None when unknown."""
+    if _HAS_PSUTIL:
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            pass
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * mmap.PAGESIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _RssSampler(threading.Thread):
+    """
+    Polls the process RSS every `interval` seconds until stop(); `peak` is the highest reading.
+    Coarse on purpose: a tighter poll steals the GIL from the pure-Python kernels it watches, and
+    the benchmark buffers live for whole samples, far longer than one interval.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.start_rss = self.peak = _rss()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        rss = _rss()
+        if rss is not None:
+            self.peak = max(self.peak or 0, rss)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+        self._sample()
+
+
+def _instrumented(budget_mb: int | None, trace: bool, func, *args, **kwargs):
+    """
+    Runs func(*args, **kwargs) under memory_budget(budget_mb) and returns (result, memory):
+    the declared peak, the budget in effect, the sampled peak RSS and its growth over the run, and
+    with trace=True the tracemalloc peak (Python and NumPy allocations; slows pure-Python kernels
+    down ~10x, so it is off for scored runs). Module level so run_isolated can pickle it.
+    """
+    mb = lambda value: round(value / _MB, 1) if value is not None else None
+    owns_trace = trace and not tracemalloc.is_tracing()
+
+    with memory_budget(budget_mb):
+        budget = _memory_budget()
+        if owns_trace:
+            tracemalloc.start()
+        elif trace:
+            tracemalloc.reset_peak()
+
+        sampler = _RssSampler()
+        sampler.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            sampler.stop()
+            traced = tracemalloc.get_traced_memory()[1] if trace else None
+            if owns_trace:
+                tracemalloc.stop()
+
+        declared = _memory.declared
+
+    growth = sampler.peak - sampler.start_rss if sampler.peak is not None else None
+    memory = {
+        "declared_mb": mb(declared),
+        "budget_mb": mb(budget),
+        "peak_rss_mb": mb(sampler.peak),
+        "rss_growth_mb": mb(growth),
+        "traced_peak_mb": mb(traced),
+        # only benchmarks that size themselves against the budget are held to it; a declared peak past
+        # the budget (the page-fault pressure pass) is deliberate, so that run is held to its declaration
+        "within_budget": growth <= max(budget, declared) if declared and budget and growth is not None else None,
+    }
+    return result, memory
+
+
+# ---------- Latency histogram ----------
+class LatencyHistogram:
+    """
+    Compact log-linear latency histogram (nanoseconds), HDR-style: each power of two is split
+    into 8 sub-buckets (~12% resolution), so a few hundred ints cover 1 ns .. minutes.
+    Histograms from different threads can be merged with merge().
+    """
+
+    SUB_BITS = 3
+    SUB_COUNT = 1 << SUB_BITS
+
+    def __init__(self) -> None:
+        self.buckets = []
+        self.count = 0
+        self.max_ns = 0
+
+    @classmethod
+    def _index(cls, ns: int) -> int:
+        if ns < cls.SUB_COUNT:
+            return ns
+        shift = ns.bit_length() - cls.SUB_BITS - 1
+        return ((shift + 1) << cls.SUB_BITS) + (ns >> shift) - cls.SUB_COUNT
+
+    @classmethod
+    def _upper(cls, index: int) -> int:
+        """Largest value that falls in bucket `index`."""
+        if index < cls.SUB_COUNT:
+            return index
+        shift = (index >> cls.SUB_BITS) - 1
+        return (((index & (cls.SUB_COUNT - 1)) + cls.SUB_COUNT + 1) << shift) - 1
+
+    def record(self, ns: int) -> None:
+        index = self._index(ns)
+        if index >= len(self.buckets):
+            self.buckets.extend([0] * (index + 1 - len(self.buckets)))
+
+        self.buckets[index] += 1
+        self.count += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if len(other.buckets) > len(self.buckets):
+            self.buckets.extend([0] * (len(other.buckets) - len(self.buckets)))
+
+        for index, n in enumerate(other.buckets):
+            self.buckets[index] += n
+
+        self.count += other.count
+        self.max_ns = max(self.max_ns, other.max_ns)
+        return self
+
+    def percentile(self, q: float) -> int:
+        """Upper bound (ns) of the bucket holding the q-th percentile, capped at the exact max."""
+        if not self.count:
+            return 0
+
+        rank = math.ceil(self.count * q / 100.0)
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self._upper(index), self.max_ns)
+
+        return self.max_ns
+
+    def summary(self) -> dict:
+        """p50 / p99 / p99.9 / max in microseconds."""
+        return {
+            "count": self.count,
+            "p50_us": round(self.percentile(50) / 1000, 1),
+            "p99_us": round(self.percentile(99) / 1000, 1),
+            "p999_us": round(self.percentile(99.9) / 1000, 1),
+            "max_us": round(self.max_ns / 1000, 1),
+        }
+
+
+def _latency_detail(summary: dict) -> str:
+    return (f"p50={summary['p50_us']:.1f}us p99={summary['p99_us']:.1f}us "
+            f"p99.9={summary['p999_us']:.1f}us max={summary['max_us']:.1f}us")
+
+
+def _merge_last(histograms: list, samples: int) -> LatencyHistogram:
+    """Merges the histograms of the last `samples` calls (drops warm-up iterations)."""
+    merged = LatencyHistogram()
+    for hist in histograms[len(histograms) - samples:]:
+        merged.merge(hist)
+    return merged
+
+
 # ---------- GPU benchmark (OpenGL FPS) ----------
-def run_gpu_benchmark(duration: float=5.0, log_panel: None=None) -> tuple[float, str]:
+def run_gpu_benchmark(duration: float=5.0, log_panel: None=None, measure: dict | None = None,
+                      fallback: bool = True) -> tuple[float, str]:
     """
     Runs a REAL GPU benchmark measuring rendering FPS using OpenGL.
+    FPS is sampled in short windows over `duration` seconds; the score uses the median.
+    Without a usable OpenGL context (missing glfw/PyOpenGL, headless or remote session) it runs
+    run_software_graphics_benchmark instead when `fallback` is True; its detail starts with
+    "software fallback".
     Returns a score of 0–10.
     """
     _safe_log(log_panel, "▶️ GPU: starting OpenGL benchmark...")
 
+    def unavailable(reason: str) -> tuple[float, str]:
+        if not fallback:
+            return 0.0, reason
+
+        score, detail = run_software_graphics_benchmark(duration, log_panel=log_panel, measure=measure)
+        return score, f"{detail} ({reason})"
+
     if not _HAS_GL:
-        return 0.0, "missing glfw / PyOpenGL"
+        return unavailable("missing glfw / PyOpenGL")
 
     try:
         if not glfw.init():
-            return 0.0, "glfw.init failed"
+            return unavailable("glfw.init failed")
 
         # Hidden window
         glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
@@ -65,38 +573,46 @@ def run_gpu_benchmark(duration: float=5.0, log_panel: None=None) -> tuple[float,
 
         if not window:
             glfw.terminate()
-            return 0.0, "create_window failed"
+            return unavailable("create_window failed")
 
         glfw.make_context_current(window)
 
-        frames = 0
-        start = time.time()
+        start = time.perf_counter()
+        # one FPS sample per window; short durations (quick preset) need shorter windows to fit
+        frame_window = min(0.25, duration / 4)
 
-        while time.time() - start < duration:
-            # Animated sine wave — heavily loads the GPU pipeline
-            t = time.time() - start
-            r = (math.sin(t * 3) - 1) / 2
+        def sample() -> float:
+            frames = 0
+            window_start = time.perf_counter()
 
-            gl.glClearColor(r * 0.6, 0.2 + 0.1 * r, 1 - r * 0.6, 1.0)
-            gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+            while True:
+                # Animated sine wave — heavily loads the GPU pipeline
+                t = time.perf_counter() - start
+                r = (math.sin(t * 3) - 1) / 2
 
-            # small CPU work to keep loop realistic
-            _ = math.sin(t) * math.cos(t)
-            glfw.swap_buffers(window)
-            glfw.poll_events()
+                gl.glClearColor(r * 0.6, 0.2 + 0.1 * r, 1 - r * 0.6, 1.0)
+                gl.glClear(gl.GL_COLOR_BUFFER_BIT)
 
-            frames += 1
+                # small CPU work to keep loop realistic
+                _ = math.sin(t) * math.cos(t)
+                glfw.swap_buffers(window)
+                glfw.poll_events()
 
-        end = time.time()
-        glfw.terminate()
+                frames += 1
+
+                elapsed = time.perf_counter() - window_start
+                if elapsed >= frame_window:
+                    return frames / elapsed
 
-        fps = frames / (end - start)
+        # duration is the sampling window: merged last so the preset's measure can't override it
+        stats = _measure(sample, {**(measure or {}), "time_budget": duration, "max_repeats": 1000}, "GPU OpenGL", "FPS")
+        glfw.terminate()
 
         # reference: 200 FPS -> 10. 20 FPS -> ~1
 
-        score = _normalize(fps, ref_min=10, ref_max=200)
+        score = _normalize(stats["median"], ref_min=10, ref_max=200)
 
-        return score, f"{round(fps,2)} FPS"
+        return score, _stats_detail(stats, "FPS")
 
     except Exception as e:
         try: glfw.terminate()
@@ -104,10 +620,122 @@ def run_gpu_benchmark(duration: float=5.0, log_panel: None=None) -> tuple[float,
             pass
         return 0.0, f"error: {e}"
 
+
+# ---------- Software graphics fallback (NumPy) ----------
+_SOFTWARE_GPU_TAG = "software fallback"
+
+
+def _software_frame_kernel(width: int, height: int, triangles: int = 16, sprites: int = 8):
+    """
+    Builds a fn(t) that renders one frame on the CPU: edge-function rasterization of `triangles`
+    flat-shaded triangles, alpha blending of `sprites` RGBA sprites, and a bilinear rescale of the
+    framebuffer to 1.25x (the "present" step).
+    """
+    rng = np.random.default_rng(0)
+    frame = np.zeros((height, width, 3), dtype=np.float32)
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+
+    # triangles in normalized coordinates, animated by a per-frame offset
+    tris = rng.random((triangles, 3, 2), dtype=np.float32) * 0.5
+    colors = rng.random((triangles, 3), dtype=np.float32)
+
+    sprite_size = max(8, min(width, height) // 4)
+    sprite_rgb = rng.random((sprites, sprite_size, sprite_size, 3), dtype=np.float32)
+    sy, sx = np.mgrid[0:sprite_size, 0:sprite_size].astype(np.float32) / (sprite_size - 1) - 0.5
+    sprite_alpha = np.clip(1.0 - 2.0 * np.sqrt(sx * sx + sy * sy), 0.0, 1.0)[..., None] * 0.8
+
+    # bilinear sampling grid for the rescale
+    out_w, out_h = int(width * 1.25), int(height * 1.25)
+    fx = np.linspace(0, width - 1, out_w, dtype=np.float32)
+    fy = np.linspace(0, height - 1, out_h, dtype=np.float32)
+    x0 = np.minimum(fx.astype(np.int32), width - 2)
+    y0 = np.minimum(fy.astype(np.int32), height - 2)
+    wx = (fx - x0)[None, :, None]
+    wy = (fy - y0)[:, None, None]
+
+    def render(t: float) -> None:
+        frame.fill(0.1)
+        shift = np.float32(0.25 + 0.25 * math.sin(t))
+
+        # rasterize: a pixel is inside when all three edge functions have the same sign
+        for tri, color in zip(tris + shift, colors):
+            (ax, ay), (bx, by), (cx, cy) = tri * (width, height)
+            x_lo, x_hi = int(max(min(ax, bx, cx), 0)), int(min(max(ax, bx, cx), width - 1)) + 1
+            y_lo, y_hi = int(max(min(ay, by, cy), 0)), int(min(max(ay, by, cy), height - 1)) + 1
+            if x_lo >= x_hi or y_lo >= y_hi:
+                continue
+
+            px, py = xs[y_lo:y_hi, x_lo:x_hi], ys[y_lo:y_hi, x_lo:x_hi]
+            e0 = (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+            e1 = (cx - bx) * (py - by) - (cy - by) * (px - bx)
+            e2 = (ax - cx) * (py - cy) - (ay - cy) * (px - cx)
+            inside = ((e0 >= 0) & (e1 >= 0) & (e2 >= 0)) | ((e0 <= 0) & (e1 <= 0) & (e2 <= 0))
+            frame[y_lo:y_hi, x_lo:x_hi][inside] = color
+
+        # alpha blend sprites: dst = src * a + dst * (1 - a)
+        for i in range(sprites):
+            x = int((width - sprite_size) * (0.5 + 0.5 * math.sin(t * 1.3 + i)))
+            y = int((height - sprite_size) * (0.5 + 0.5 * math.cos(t * 0.7 + i * 2)))
+            dst = frame[y:y + sprite_size, x:x + sprite_size]
+            dst += (sprite_rgb[i] - dst) * sprite_alpha
+
+        # bilinear rescale: blend gathered rows, then gathered columns
+        rows = np.take(frame, y0, axis=0)
+        rows += (np.take(frame, y0 + 1, axis=0) - rows) * wy
+        scaled = np.take(rows, x0, axis=1)
+        scaled += (np.take(rows, x0 + 1, axis=1) - scaled) * wx
+
+    return render
+
+
+def run_software_graphics_benchmark(duration: float = 5.0, width: int = 1024, height: int = 768,
+                                    log_panel: None=None, measure: dict | None = None) -> tuple[float, str]:
+    """
+    CPU-rendered graphics benchmark for machines without a usable OpenGL context (headless, RDP).
+    Renders framebuffer-sized frames with NumPy (see _software_frame_kernel) and reports FPS.
+    The score uses its own reference range, so it reflects CPU/memory graphics throughput, not a GPU.
+    """
+    _safe_log(log_panel, "▶️ GPU: no OpenGL context, running software graphics fallback...")
+
+    if not _HAS_NUMPY:
+        return 0.0, f"{_SOFTWARE_GPU_TAG}: missing numpy"
+
+    try:
+        render = _software_frame_kernel(width, height)
+        start = time.perf_counter()
+        # one FPS sample per window; short durations (quick preset) need shorter windows to fit
+        frame_window = min(0.25, duration / 4)
+
+        def sample() -> float:
+            frames = 0
+            window_start = time.perf_counter()
+
+            while True:
+                render(time.perf_counter() - start)
+                frames += 1
+
+                elapsed = time.perf_counter() - window_start
+                if elapsed >= frame_window:
+                    return frames / elapsed
+
+        stats = _measure(sample, {**(measure or {}), "time_budget": duration, "max_repeats": 1000},
+                         "GPU software", "FPS")
+
+        # reference: 60 FPS at 1024x768 -> 10, 3 FPS -> 0
+        score = _normalize(stats["median"], ref_min=3, ref_max=60)
+
+        return score, f"{_SOFTWARE_GPU_TAG} {width}x{height} — {_stats_detail(stats, 'FPS')}"
+
+    except Exception as e:
+        return 0.0, f"{_SOFTWARE_GPU_TAG}: error: {e}"
+
+
 # ---------- CPU benchmark ---------
-def run_cpu_benchmark(iter_mult: int = 1, log_panel: None=None) -> tuple[float, str]:
+def run_cpu_benchmark(iter_mult: int = 1, log_panel: None=None, measure: dict | None = None,
+                      target: float | None = None) -> tuple[float, str]:
     """
     CPU benchmark: uses numpy matrix multiply (if available) or a fallback integer loop.
+    With `target` (seconds per sample) the problem size is calibrated instead of using iter_mult.
     Returns score 0-10 and a detail string (ops/sec or duration).
     """
     _safe_log(log_panel, "▶️ CPU: starting synthetic benchmark...")
@@ -118,26 +746,44 @@ def run_cpu_benchmark(iter_mult: int = 1, log_panel: None=None) -> tuple[float,
 
     if _HAS_NUMPY:
         n = 1000 * iter_mult  # matrix size. adjust per machine
-        # limit memory: ensure n isn't insane
-        if n > 3000:
-            n = 3000
 
-        try:
-            a = np.random.rand(n, n).astype(np.float32)
-            b = np.random.rand(n, n).astype(np.float32)
+        # limit memory: ensure n isn't insane. Peak is a, b and the product, three float32 n x n
+        # matrices (the calibration probe needs two)
+        max_n = _fit_memory(3000 if target else min(n, 3000), lambda size: 3 * size * size * 4, 128,
+                            log_panel, "CPU matmul")
+
+        if target:
+            def probe(size: int) -> float:
+                m = np.ones((size, size), dtype=np.float32)
+                start = time.perf_counter()
+                m.dot(m)
+                return time.perf_counter() - start
 
-            start = time.time()
-            _ = a.dot(b)
-            duration = time.time() - start
+            # matmul time grows with n^3; round to a BLAS-friendly multiple of 64
+            n = _calibrate(probe, 256, target, 128, max_n, exponent=3.0) // 64 * 64
+
+        n = min(n, max_n)
+
+        try:
+            # generated directly as float32: rand() + astype() briefly holds a float64 copy twice the size
+            rng = np.random.default_rng()
+            a = rng.random((n, n), dtype=np.float32)
+            b = rng.random((n, n), dtype=np.float32)
 
             # approximate FLOPS for matmul ~ 2*n^3 operations
             flops = 2.0 * (n ** 3)
-            gflops = flops / (duration * 1e9)
+
+            def sample() -> float:
+                start = time.perf_counter()
+                _ = a.dot(b)
+                return flops / ((time.perf_counter() - start) * 1e9)
+
+            stats = _measure(sample, measure, "CPU matmul", "GFLOPS")
 
             # Scientific standardization
-            score = _normalize(gflops, ref_min=REF_MIN, ref_max=REF_MAX)
+            score = _normalize(stats["median"], ref_min=REF_MIN, ref_max=REF_MAX)
 
-            return score, f"{gflops:.2f} GFLOPS (time {duration:.2f}s)"
+            return score, f"{n}x{n} matmul {_stats_detail(stats, 'GFLOPS')}"
 
         except MemoryError:
             return 0.0, "MemoryError"
@@ -146,220 +792,2875 @@ def run_cpu_benchmark(iter_mult: int = 1, log_panel: None=None) -> tuple[float,
 
     # Fallback (no numpy): CPU-bound hashing loop
     try:
-        import hashlib
-        iters = 200_000
-        start = time.time()
+        iters = 20_000
         s = b"benchmark"
 
-        for i in range(iters):
-            hashlib.sha256(s + str(i).encode()).digest()
+        if target:
+            def probe(size: int) -> float:
+                start = time.perf_counter()
+                for i in range(size):
+                    hashlib.sha256(s + str(i).encode()).digest()
+                return time.perf_counter() - start
+
+            iters = _calibrate(probe, 1000, target, 1000, 10_000_000)
+
+        def sample() -> float:
+            start = time.perf_counter()
+
+            for i in range(iters):
+                hashlib.sha256(s + str(i).encode()).digest()
 
-        duration = time.time() - start
+            return iters / (time.perf_counter() - start)
 
-        # map duration to score: faster -> higher
-        score = _normalize(1.0 / max(duration, 0.0001), ref_min=0.01, ref_max=1.0)
+        stats = _measure(sample, measure, "CPU hash loop", "hashes/s")
 
-        return score, f"hash loop {iters} iters in {duration:.2f}s"
+        # map throughput to score: reference is 200k hashes per 100s .. per 1s
+        score = _normalize(stats["median"] / 200_000, ref_min=0.01, ref_max=1.0)
+
+        return score, f"hash loop {_stats_detail(stats, 'hashes/s')}"
 
     except Exception as e:
         return 0.0, f"error: {e}"
 
 
-# ---------- RAM benchmark ----------
-def run_ram_benchmark(size_mb: int = 1024, log_panel: None=None) -> tuple[float, str]:
-    """
-    Allocate buffers and measure sequential memory read/write bandwidth.
-    Returns score 0-10 and detail string.
-    """
-
-    _safe_log(log_panel, f"▶️ RAM: testing {size_mb} MB allocation...")
+# ---------- CPU scaling benchmark ----------
+_HASH_BUFFER = b"\x5a" * (1024 * 1024)
 
-    if not _HAS_NUMPY:
-        # fallback: try to allocate a large bytearray
-        try:
-            start = time.time()
-            b = bytearray(size_mb * 1024 * 1024)
 
-            # Write pattern
-            for i in range(0, len(b), 4096):
-                b[i] = (i % 256)
+def _cpu_kernel_python(units: int) -> None:
+    """Pure-Python integer loop (holds the GIL). One unit = 1000 iterations."""
+    acc = 0
+    for i in range(units * 1000):
+        acc = (acc * 31 + i) & 0xFFFFFFFF
 
-            # Read sum
-            s = 0
-            for i in range(0, len(b), 4096):
-                s += b[i]
 
-            duration = time.time() - start
-            mbps = size_mb / duration
-            score = _normalize(mbps, ref_min=500.0, ref_max=70000.0) # range tuned generously
+def _cpu_kernel_hash(units: int) -> None:
+    """sha256 over a 1 MB buffer (hashlib releases the GIL). One unit = 1 MB."""
+    for _ in range(units):
+        hashlib.sha256(_HASH_BUFFER).digest()
 
-            return score, f"{mbps:.2f} MB/s ({duration:.2f}s)"
 
-        except MemoryError:
-            return 0.0, "MemoryError"
-        except Exception as e:
-            return 0.0, f"error: {e}"
+def _cpu_kernel_numpy(units: int) -> None:
+    """Element-wise float64 ufuncs (release the GIL). One unit = 2 * 131072 FLOP."""
+    a = np.linspace(0.0, 1.0, 131072)
+    b = np.empty_like(a)
+    for _ in range(units):
+        np.multiply(a, 1.000001, out=b)
+        np.add(b, a, out=b)
 
-    try:
-        # use numpy for faster and realistic memory ops
-        arr = np.random.randint(0, 255, size=(size_mb * 256,), dtype=np.uint8)  # ~size_mb MB
-        start = time.time()
 
-        # sequential write (set)
-        arr[:] = 123
-        # sequential read (sum)
-        _ = arr.sum()
+# name -> (kernel, executor kind, unit label, throughput per unit, default units, top per-core throughput)
+CPU_SCALING_KERNELS = {
+    "python": (_cpu_kernel_python, "process", "Kiter/s", 1.0, 2000, 15000.0),
+    "hash": (_cpu_kernel_hash, "thread", "MB/s", 1.0, 200, 2000.0),
+    "numpy": (_cpu_kernel_numpy, "thread", "MFLOP/s", 0.262144, 1000, 4000.0),
+}
 
-        duration = time.time() - start
-        mbps = size_mb / duration
 
-        score = _normalize(mbps, ref_min=500.0, ref_max=70000.0)
+def _cpu_scaling_worker(kernel: str, units: int) -> float:
+    """Runs one kernel batch and returns its duration. Module level so process pools can pickle it."""
+    func = CPU_SCALING_KERNELS[kernel][0]
+    start = time.perf_counter()
+    func(units)
+    return time.perf_counter() - start
 
-        return score, f"{mbps:.2f} MB/s ({duration:.2f}s)"
 
-    except MemoryError:
-        return 0.0, "MemoryError"
-    except Exception as e:
-        return 0.0, f"error: {e}"
+def _worker_counts(max_workers: int) -> list[int]:
+    """1, 2, 4, ... up to max_workers (always included)."""
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+    return counts
 
 
-# ---------- Disk benchmark ----------
-def run_disk_benchmark(size_mb: int = 500, log_panel: None=None) -> tuple[float, str]:
+def run_cpu_scaling_benchmark(kernel: str = "python", max_workers: int | None = None,
+                              units: int | None = None, log_panel: None=None,
+                              measure: dict | None = None, target: float | None = None,
+                              worker_counts: list[int] | None = None) -> dict:
     """
-    Sequential write/read and a small random read test.
-    Returns score 0-10 and detail string.
+    Runs the same CPU kernel on 1, 2, 4, ... N workers (or the given `worker_counts`; 1 worker is
+    always measured first, as the baseline for efficiency and the single-core score).
+    Pure-Python kernels use a process pool, GIL-releasing kernels (hashlib, numpy) use threads.
+    With `target` (seconds per batch) the units per worker are calibrated in-process.
+    Returns a dict with one row per worker count (per-worker / aggregate throughput and
+    scaling efficiency) plus single-core and all-core (score, detail) tuples.
     """
-    _safe_log(log_panel, f"▶️ DISK: testing {size_mb} MB sequential write/read...")
+    max_workers = max_workers or os.cpu_count() or 1
+    _safe_log(log_panel, f"▶️ CPU: scaling '{kernel}' kernel on 1..{max_workers} workers...")
 
-    tmp_dir = tempfile.mkdtemp()
-    file_path = os.path.join(tmp_dir, "disk_test.bin")
-
-    try:
-        block = os.urandom(1024 * 1024)  # 1MB block
+    result = {"kernel": kernel, "unit": "", "rows": [],
+              "single_core": (0.0, ""), "all_core": (0.0, "")}
 
-        # Write
-        start = time.time()
+    if kernel not in CPU_SCALING_KERNELS:
+        result["single_core"] = result["all_core"] = (0.0, f"unknown kernel '{kernel}'")
+        return result
 
-        with open(file_path, "wb") as f:
-            for _ in range(size_mb):
-                f.write(block)
+    if kernel == "numpy" and not _HAS_NUMPY:
+        result["single_core"] = result["all_core"] = (0.0, "missing numpy")
+        return result
 
-            f.flush()
-            os.fsync(f.fileno())
+    _, executor_kind, unit, per_unit, default_units, ref_core = CPU_SCALING_KERNELS[kernel]
+    if target and not units:
+        units = _calibrate(lambda u: _cpu_scaling_worker(kernel, u), 1, target, 1, 1_000_000)
 
-        write_time = time.time() - start
-        write_mb_s = size_mb / write_time if write_time > 0 else 0.0
-        _safe_log(log_panel, f"DISK write: {write_mb_s:.2f} MB/s ({write_time:.2f}s)")
+    units = units or default_units
+    result["unit"] = unit
+    pool_cls = ProcessPoolExecutor if executor_kind == "process" else ThreadPoolExecutor
+    counts = [1] + sorted({n for n in worker_counts if n > 1}) if worker_counts else _worker_counts(max_workers)
 
-        # Read sequential
-        start = time.time()
+    try:
+        base_aggregate = 0.0
 
-        with open(file_path, "rb") as f:
-            while f.read(1024 * 1024):
-                pass
+        for workers in counts:
+            with pool_cls(max_workers=workers) as pool:
+                # warm up: spawn every worker before timing
+                list(pool.map(_cpu_scaling_worker, [kernel] * workers, [1] * workers))
 
-        read_time = time.time() - start
-        read_mb_s = size_mb / read_time if read_time > 0 else 0.0
-        _safe_log(log_panel, f"DISK read: {read_mb_s:.2f} MB/s ({read_time:.2f}s)")
+                per_worker_samples = []
 
-        # small random reads (10 x 4MB)
-        import random
+                def sample() -> float:
+                    start = time.perf_counter()
+                    durations = list(pool.map(_cpu_scaling_worker, [kernel] * workers, [units] * workers))
+                    wall = time.perf_counter() - start
 
-        rand_reads = 10
-        rand_block = 4
-        start = time.time()
+                    per_worker_samples.append(sum(units * per_unit / d for d in durations if d > 0) / workers)
+                    return workers * units * per_unit / wall if wall > 0 else 0.0
 
-        with open(file_path, "rb") as f:
-            for _ in range(rand_reads):
-                pos = random.randint(0, max(0, size_mb - rand_block)) * 1204 * 1024
-                f.seek(pos)
-                f.read(rand_block * 1024 * 1024)
+                stats = _measure(sample, {"warmup": 0, "min_repeats": 3, "max_repeats": 10,
+                                          "time_budget": 2.0, **(measure or {})}, f"CPU x{workers}", unit)
 
-        rand_time = time.time() - start
-        rand_mb_s = (rand_reads * rand_block) / rand_time if rand_time > 0 else 0.0
-        _safe_log(log_panel, f"DISK random read: {rand_mb_s:.2f} MB/s ({rand_time:.2f}s)")
+            aggregate = stats["median"]
+            per_worker = _percentile(sorted(per_worker_samples), 50)
 
-        # normalize using read/write averages (tune refs per expectations)
-        metric = (write_mb_s * 0.5) + (read_mb_s * 0.4) + (rand_mb_s * 0.1)
+            if workers == 1:
+                base_aggregate = aggregate
 
-        score = _normalize(metric, ref_min=20.0, ref_max=2000.0)
-        detail = f"seq_write={write_mb_s:.2f}MB/s seq_read={read_mb_s:.2f}MB/s rand_read={rand_mb_s:.2f}MB/s"
+            efficiency = aggregate / (workers * base_aggregate) if base_aggregate > 0 else 0.0
 
-        return score, detail
+            result["rows"].append({
+                "workers": workers,
+                "per_worker": round(per_worker, 2),
+                "aggregate": round(aggregate, 2),
+                "efficiency": round(efficiency, 3),
+                "noisy": stats["noisy"],
+            })
+            _safe_log(log_panel, f"CPU x{workers}: {per_worker:.2f} {unit}/worker, "
+                                 f"{aggregate:.2f} {unit} total, efficiency {efficiency:.0%}")
 
     except Exception as e:
-        return 0.0, f"error: {e}"
+        result["single_core"] = result["all_core"] = (0.0, f"error: {e}")
+        return result
 
-    finally:
+    first, last = result["rows"][0], result["rows"][-1]
+
+    # references: low-end core ~1/15 of a top core; all-core tops out at 16 top cores
+    single_score = _normalize(first["aggregate"], ref_min=ref_core / 15, ref_max=ref_core)
+    all_score = _normalize(last["aggregate"], ref_min=ref_core * 2 / 15, ref_max=ref_core * 16)
+
+    result["single_core"] = (single_score, f"{first['aggregate']:.2f} {unit} (1 worker)")
+    result["all_core"] = (all_score, f"{last['aggregate']:.2f} {unit} ({last['workers']} workers, "
+                                     f"efficiency {last['efficiency']:.0%})")
+    return result
+
+
+# ---------- Sustained-load thermal throttling ----------
+def _cpu_frequency() -> float | None:
+    """Current average core clock in MHz: cpufreq in /sys, then psutil; None when unknown."""
+    try:
+        values = []
+        base = "/sys/devices/system/cpu"
+        for name in os.listdir(base):
+            path = os.path.join(base, name, "cpufreq", "scaling_cur_freq")
+            if name.startswith("cpu") and name[3:].isdigit() and os.path.exists(path):
+                with open(path) as f:
+                    values.append(int(f.read()) / 1000.0)
+        if values:
+            return sum(values) / len(values)
+    except (OSError, ValueError):
+        pass
+
+    if _HAS_PSUTIL:
         try:
-            shutil.rmtree(tmp_dir)
+            freq = psutil.cpu_freq()
+            if freq and freq.current:
+                return float(freq.current)
         except Exception:
             pass
 
+    return None
 
-# ---------- High-level runner ----------
-class PerformanceTester():
 
-    def __init__(self, log_panel=None, gpu_duration: float = 5.0) -> None:
-        self.log_panel = log_panel
-        self.gpu_duration = gpu_duration
+def _smooth(values: list[float], width: int = 3) -> list[float]:
+    """Centered rolling median, so a single slow/fast window is not taken as peak or onset."""
+    half = width // 2
+    return [_percentile(sorted(values[max(0, i - half):i + half + 1]), 50) for i in range(len(values))]
 
-    def _log(self, msg) -> None:
-        if self.log_panel:
-            _safe_log(self.log_panel, msg)
-        else:
-            print(msg)
 
-    def run_all(self, async_run: bool = False):
-        """
-        Runs CPU, RAM, Disk, GPU. If async_run True => runs in a background thread and returns immediately.
-        Otherwise, blocks and returns a results dict.
-        """
+def _throttle_analysis(series: list[dict], window: float, threshold: float) -> dict:
+    """
+    Peak = best smoothed window; steady state = median of the last quarter of the run.
+    Onset = start of the first window after the peak from which throughput stays more than
+    `threshold` below the peak for the rest of the run.
+    """
+    throughput = _smooth([row["throughput"] for row in series])
+    peak_index = max(range(len(throughput)), key=throughput.__getitem__)
+    peak = throughput[peak_index]
+    tail = max(3, len(series) // 4)
+    steady = _percentile(sorted(row["throughput"] for row in series[-tail:]), 50)
+    drop = (peak - steady) / peak if peak > 0 else 0.0
+
+    onset = None
+    if drop > threshold:
+        limit = peak * (1 - threshold)
+        for i in range(len(throughput) - 1, peak_index, -1):
+            if throughput[i] >= limit:
+                break
+            onset = series[i]["t"] - window
+
+    mhz = [row["mhz"] for row in series if row["mhz"]]
+    return {
+        "peak": round(peak, 2),
+        "steady": round(steady, 2),
+        "drop_pct": round(drop * 100, 1),
+        "onset_s": round(onset, 1) if onset is not None else None,
+        "throttling": onset is not None,
+        "peak_mhz": round(max(_smooth(mhz)), 0) if mhz else None,
+        "steady_mhz": round(_percentile(sorted(mhz[-tail:]), 50), 0) if mhz else None,
+    }
+
+
+def run_thermal_benchmark(duration: float = 60.0, window: float = 1.0, kernel: str = "hash",
+                          workers: int | None = None, threshold: float = 0.05,
+                          log_panel: None=None) -> dict:
+    """
+    Keeps every core busy with a CPU_SCALING_KERNELS kernel for `duration` seconds and samples
+    aggregate throughput (and the CPU clock, when readable) in fixed `window`-second windows.
+    Short benchmarks finish before a laptop heats up; this shows the drop from peak to steady
+    state and when it starts. Each batch is credited to the windows it overlapped, so the
+    series stays smooth even with few workers.
+    Returns a dict with the per-window series, peak / steady throughput, drop_pct, onset_s
+    (seconds until throttling starts, None if throughput held) and a (score, detail) tuple.
+    """
+    workers = workers or os.cpu_count() or 1
+    _safe_log(log_panel, f"▶️ CPU: sustained '{kernel}' load on {workers} workers for {duration:.0f}s...")
 
-        if async_run:
-            thread = threading.Thread(target=self.run_all_internal, daemon=True)
-            thread.start()
-            print(thread)
-            return thread
+    result = {"kernel": kernel, "unit": "", "series": [], "score": (0.0, "")}
 
-        else:
-            return self.run_all_internal()
+    if kernel not in CPU_SCALING_KERNELS:
+        result["score"] = (0.0, f"unknown kernel '{kernel}'")
+        return result
 
-    def run_all_internal(self) -> dict:
-        self._log("▶️ Starting full hardware benchmark suite...")
+    if kernel == "numpy" and not _HAS_NUMPY:
+        result["score"] = (0.0, "missing numpy")
+        return result
 
-        # CPU
-        cpu_score, cpu_detail = run_cpu_benchmark(log_panel=self.log_panel)
-        self._log(f"🖥 CPU Score: {cpu_score}/10  — {cpu_detail}")
+    _, executor_kind, unit, per_unit, _, _ = CPU_SCALING_KERNELS[kernel]
+    result["unit"] = unit
+    pool_cls = ProcessPoolExecutor if executor_kind == "process" else ThreadPoolExecutor
+    reporter = _reporter()
 
-        # RAM
-        ram_score, ram_detail = run_ram_benchmark(log_panel=self.log_panel)
-        self._log(f"💾 RAM Score: {ram_score}/10 — {ram_detail}")
+    try:
+        # ~10 batches per worker per window keeps the per-window credit fine-grained
+        units = _calibrate(lambda u: _cpu_scaling_worker(kernel, u), 1, window / 10, 1, 1_000_000)
+        windows = max(int(duration / window), 4)
+        work = [0.0] * windows
+
+        with pool_cls(max_workers=workers) as pool:
+            list(pool.map(_cpu_scaling_worker, [kernel] * workers, [1] * workers))
+
+            start = time.perf_counter()
+            end = start + windows * window
+            pending = {pool.submit(_cpu_scaling_worker, kernel, units) for _ in range(workers)}
+            next_window = 0
+
+            while pending:
+                done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                now = time.perf_counter()
+
+                for future in done:
+                    batch = future.result()
+                    # credit the batch's work to the windows its [now - batch, now] interval covers
+                    lo, hi = now - batch - start, now - start
+                    rate = units * per_unit / batch if batch > 0 else 0.0
+                    for i in range(max(int(lo / window), 0), min(int(hi / window), windows - 1) + 1):
+                        overlap = min(hi, (i + 1) * window) - max(lo, i * window)
+                        if overlap > 0:
+                            work[i] += rate * overlap
+
+                    if now < end:
+                        pending.add(pool.submit(_cpu_scaling_worker, kernel, units))
+
+                # close finished windows; batches still running are credited to them when they complete
+                while next_window < windows and now >= start + (next_window + 1) * window:
+                    result["series"].append({"t": round((next_window + 1) * window, 2),
+                                             "throughput": 0.0, "mhz": _cpu_frequency()})
+                    next_window += 1
+
+                    if reporter:
+                        reporter.check()
+                        reporter.emit("CPU sustained", next_window / windows, work[next_window - 1] / window,
+                                      unit, next_window)
+
+        for i, row in enumerate(result["series"]):
+            row["throughput"] = round(work[i] / window, 2)
+
+    except BenchmarkCancelled:
+        raise
+    except Exception as e:
+        result["score"] = (0.0, f"error: {e}")
+        return result
 
-        # Disk
-        disk_score, disk_detail = run_disk_benchmark(log_panel=self.log_panel)
-        self._log(f"🗄 Disk Score: {disk_score}/10 — {disk_detail}")
+    result.update(_throttle_analysis(result["series"], window, threshold))
 
-        # GPU
-        gpu_score, gpu_detail = run_gpu_benchmark(duration= self.gpu_duration, log_panel=self.log_panel)
-        self._log(f"🎮 GPU Score: {gpu_score}/10 — {gpu_detail}")
+    # sustained/peak ratio: 1.0 -> 10, a 50% drop -> 0
+    score = _normalize(result["steady"] / result["peak"] if result["peak"] else 0.0, ref_min=0.5, ref_max=1.0)
+    clock = f", {result['peak_mhz']:.0f} → {result['steady_mhz']:.0f} MHz" if result["peak_mhz"] else ""
+    onset = f"after {result['onset_s']}s" if result["throttling"] else "no throttling"
 
-        # Final weighted score
-        # Weights: CPU 30%, RAM 20%, Disk 20%, GPU 30%
-        final = round(cpu_score * 0.30 + ram_score * 0.20 + disk_score * 0.20 + gpu_score * 0.30, 2)
-        self._log(f"🏆 Final Score: {final}/10")
+    result["score"] = (score, f"{result['peak']:.1f} → {result['steady']:.1f} {unit} "
+                              f"(-{result['drop_pct']}%, {onset}{clock})")
+    _safe_log(log_panel, f"CPU sustained: {result['score'][1]}")
+    return result
 
-        return {
-            "CPU": (cpu_score, cpu_detail),
-            "RAM": (ram_score, ram_detail),
-            "Disk": (disk_score, disk_detail),
-            "GPU": (gpu_score, gpu_detail),
-            "Final": final
-        }
 
+# ---------- Application workload suite ----------
+_WORDS = ("error", "user", "request", "timeout", "cache", "session", "disk", "update", "service", "network",
+          "login", "payment", "render", "thread", "queue", "report", "config", "backup", "search", "token")
 
-# If run directly
-if __name__ == "__main__":
-    tester = PerformanceTester()
-    res = tester.run_all()
-    print(res)
+
+def _workload_records(count: int, seed: int = 0) -> list[dict]:
+    """Deterministic log-like records shared by the JSON, regex and SQLite workloads."""
+    rng = random.Random(seed)
+    return [{
+        "id": i,
+        "user": f"{rng.choice(_WORDS)}{rng.randrange(10_000)}@example.com",
+        "ip": ".".join(str(rng.randrange(256)) for _ in range(4)),
+        "time": f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}T{rng.randrange(24):02d}:"
+                f"{rng.randrange(60):02d}:{rng.randrange(60):02d}",
+        "level": rng.choice(("INFO", "WARN", "ERROR", "DEBUG")),
+        "message": " ".join(rng.choice(_WORDS) for _ in range(rng.randrange(5, 20))),
+        "latency_ms": round(rng.random() * 500, 3),
+    } for i in range(count)]
+
+
+def _workload_text(records: list[dict]) -> str:
+    return "\n".join(f"{r['time']} {r['level']} [{r['ip']}] {r['user']}: {r['message']} ({r['latency_ms']} ms)"
+                     for r in records)
+
+
+_WORKLOAD_PATTERN = re.compile(r"(\d{4}-\d\d-\d\dT[\d:]+) (ERROR|WARN) \[([\d.]+)\] ([\w.]+@[\w.]+):")
+
+
+def _workload_zlib(work_dir: str):
+    data = _workload_text(_workload_records(2000)).encode()  # ~200 KB
+
+    def op() -> None:
+        zlib.decompress(zlib.compress(data, 6))
+
+    return op, None
+
+
+def _workload_lzma(work_dir: str):
+    data = _workload_text(_workload_records(500)).encode()  # ~50 KB
+
+    def op() -> None:
+        lzma.decompress(lzma.compress(data, preset=1))
+
+    return op, None
+
+
+def _workload_json(work_dir: str):
+    records = _workload_records(200)
+
+    def op() -> None:
+        json.loads(json.dumps(records))
+
+    return op, None
+
+
+def _workload_regex(work_dir: str):
+    text = _workload_text(_workload_records(2000))
+
+    def op() -> None:
+        for match in _WORKLOAD_PATTERN.finditer(text):
+            match.group(4)
+
+    return op, None
+
+
+def _workload_sqlite(work_dir: str):
+    """
+    One op = a transaction of 100 inserts plus an indexed aggregate query, on a WAL database.
+    The transaction deletes its rows again, so the table stays the same size however long it runs.
+    """
+    conn = sqlite3.connect(os.path.join(work_dir, "workload.db"))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, user TEXT, level TEXT, message TEXT, latency REAL)")
+    conn.execute("CREATE INDEX events_user ON events(user)")
+    rows = [(r["user"], r["level"], r["message"], r["latency_ms"]) for r in _workload_records(100)]
+
+    def op() -> None:
+        with conn:
+            conn.executemany("INSERT INTO events (user, level, message, latency) VALUES (?, ?, ?, ?)", rows)
+            conn.execute("SELECT level, COUNT(*), AVG(latency) FROM events WHERE user = ? GROUP BY level",
+                         (rows[0][0],)).fetchall()
+            conn.execute("DELETE FROM events")
+
+    return op, conn.close
+
+
+def _workload_image(work_dir: str):
+    """One op = Full HD RGB photo-sized image downscaled to 640x360 with Lanczos."""
+    rng = random.Random(0)
+    image = Image.frombytes("RGB", (1920, 1080), rng.randbytes(1920 * 1080 * 3))
+
+    def op() -> None:
+        image.resize((640, 360), Image.LANCZOS)
+
+    return op, None
+
+
+# name -> (builder(work_dir) -> (op, cleanup), top ops/s on a current desktop core)
+WORKLOADS = {
+    "zlib": (_workload_zlib, 110.0),
+    "lzma": (_workload_lzma, 210.0),
+    "json": (_workload_json, 2000.0),
+    "regex": (_workload_regex, 240.0),
+    "sqlite": (_workload_sqlite, 2100.0),
+    "image": (_workload_image, 120.0),
+}
+
+
+def run_workload_benchmark(workloads: tuple | None = None, log_panel: None=None, measure: dict | None = None,
+                           target: float | None = None) -> dict:
+    """
+    Application-level workloads: zlib/lzma round trips of a log corpus, JSON encode+decode,
+    regex scanning, SQLite insert/query transactions in a temp database and a PIL image resize.
+    Each reports ops/s and a 0-10 score against a current desktop core (ref/15 -> 0).
+    Returns {"workloads": {name: {"ops_s", "score", "detail"}}, "score": (score, detail)} where
+    the overall score is the mean of the workloads that could run.
+    """
+    _safe_log(log_panel, "▶️ APP: running application workload suite...")
+
+    result = {"workloads": {}, "score": (0.0, "")}
+    work_dir = tempfile.mkdtemp()
+
+    try:
+        for name in workloads or WORKLOADS:
+            builder, ref = WORKLOADS[name]
+
+            if name == "image" and not _HAS_PIL:
+                result["workloads"][name] = {"ops_s": 0.0, "score": None, "detail": "missing Pillow"}
+                continue
+
+            cleanup = None
+
+            try:
+                op, cleanup = builder(work_dir)
+
+                def run(batch: int) -> float:
+                    start = time.perf_counter()
+                    for _ in range(batch):
+                        op()
+                    return time.perf_counter() - start
+
+                batch = _calibrate(run, 1, target or 0.1, 1, 1_000_000)
+
+                def sample() -> float:
+                    return batch / run(batch)
+
+                stats = _measure(sample, measure, f"APP {name}", "ops/s")
+                score = _normalize(stats["median"], ref_min=ref / 15, ref_max=ref)
+                detail = _stats_detail(stats, "ops/s")
+
+            except BenchmarkCancelled:
+                raise
+            except Exception as e:
+                score, detail = None, f"error: {e}"
+                stats = {"median": 0.0}
+
+            finally:
+                if cleanup:
+                    cleanup()
+
+            result["workloads"][name] = {"ops_s": round(stats["median"], 2), "score": score, "detail": detail}
+            _safe_log(log_panel, f"APP {name}: {detail}")
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    ran = {name: w for name, w in result["workloads"].items() if w["score"] is not None}
+    if not ran:
+        result["score"] = (0.0, "no workload could run")
+        return result
+
+    score = round(sum(w["score"] for w in ran.values()) / len(ran), 2)
+    detail = " ".join(f"{name}={w['ops_s']:.0f}" for name, w in ran.items()) + " ops/s"
+    skipped = [name for name in result["workloads"] if name not in ran]
+    if skipped:
+        detail += f" (skipped: {', '.join(skipped)})"
+
+    result["score"] = (score, detail)
+    return result
+
+
+# ---------- Process spawn latency ----------
+def _spawn_commands() -> dict:
+    """Trivial child processes: a native executable started directly, and an empty shell command."""
+    if os.name == "nt":
+        direct = [os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32", "hostname.exe")]
+    else:
+        direct = [shutil.which("true") or "/bin/true"]
+
+    return {"direct": (direct, False), "shell": ("exit 0", True)}
+
+
+def run_spawn_benchmark(max_spawns: int = 300, time_budget: float = 3.0, log_panel: None=None) -> dict:
+    """
+    Starts a trivial child process up to `max_spawns` times per mode (directly, and through the
+    shell like SystemActions' subprocess.run(..., shell=True)) and waits for it to exit.
+    Antivirus / endpoint agents scan every launch, so slow spawns flag those machines.
+    Returns {mode: {"spawns_s", "latency"}} plus a (score, detail) tuple scored on the direct p50.
+    """
+    _safe_log(log_panel, "▶️ SPAWN: process creation latency...")
+
+    result = {"modes": {}, "score": (0.0, "")}
+
+    try:
+        for mode, (cmd, shell) in _spawn_commands().items():
+            hist = LatencyHistogram()
+            run = lambda: subprocess.run(cmd, shell=shell, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+            # warm-up spawn: the first launch loads the image and warms scanner caches
+            run()
+
+            start = time.perf_counter()
+            while hist.count < max_spawns and time.perf_counter() - start < time_budget / 2:
+                _checkpoint()
+                t0 = time.perf_counter_ns()
+                run()
+                hist.record(time.perf_counter_ns() - t0)
+
+            elapsed = time.perf_counter() - start
+            latency = hist.summary()
+            spawns_s = hist.count / elapsed if elapsed > 0 else 0.0
+
+            result["modes"][mode] = {"spawns_s": round(spawns_s, 1), "latency": latency}
+            _safe_log(log_panel, f"SPAWN {mode}: {spawns_s:.0f} spawns/s {_latency_detail(latency)}")
+
+    except Exception as e:
+        result["score"] = (0.0, f"error: {e}")
+        return result
+
+    # log scale on direct p50: 1 ms -> 10, 100 ms (every launch scanned) -> 0
+    p50_us = max(result["modes"]["direct"]["latency"]["p50_us"], 1.0)
+    score = round(10.0 - _normalize(math.log10(p50_us), ref_min=3.0, ref_max=5.0), 2)
+
+    detail = " ".join(f"{mode}={row['spawns_s']:.0f}/s p50={row['latency']['p50_us'] / 1000:.1f}ms "
+                      f"p99={row['latency']['p99_us'] / 1000:.1f}ms"
+                      for mode, row in result["modes"].items())
+    result["score"] = (score, detail)
+    return result
+
+
+# ---------- Loopback network benchmark ----------
+_NET_BULK, _NET_ECHO = b"B", b"E"
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
+
+
+def _net_handler(conn: socket.socket, message_size: int, buffer_size: int) -> None:
+    """Server side of one connection: bulk sink (acks the byte count) or fixed-size echo."""
+    try:
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        mode = _recv_exact(conn, 1)
+
+        if mode == _NET_BULK:
+            buf = bytearray(buffer_size)
+            received = 0
+            while True:
+                n = conn.recv_into(buf)
+                if not n:
+                    break
+                received += n
+            conn.sendall(struct.pack("!Q", received))
+        else:
+            while True:
+                conn.sendall(_recv_exact(conn, message_size))
+    except (OSError, ConnectionError):
+        pass
+    finally:
+        conn.close()
+
+
+def _net_server(listener: socket.socket, message_size: int, buffer_size: int) -> None:
+    while True:
+        try:
+            conn, _ = listener.accept()
+        except OSError:
+            return  # listener closed
+        threading.Thread(target=_net_handler, args=(conn, message_size, buffer_size), daemon=True).start()
+
+
+def _net_bulk_client(address, buffer_size: int, duration: float) -> int:
+    """Streams buffer_size sends for `duration` seconds; returns the bytes the server received."""
+    payload = os.urandom(buffer_size)
+
+    with socket.create_connection(address) as sock:
+        sock.sendall(_NET_BULK)
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+        return struct.unpack("!Q", _recv_exact(sock, 8))[0]
+
+
+def _net_echo_client(address, message_size: int, duration: float) -> LatencyHistogram:
+    """Request/response round trips of message_size bytes for `duration` seconds."""
+    hist = LatencyHistogram()
+    message = os.urandom(message_size)
+
+    with socket.create_connection(address) as sock:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(_NET_ECHO)
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter_ns()
+            sock.sendall(message)
+            _recv_exact(sock, message_size)
+            hist.record(time.perf_counter_ns() - t0)
+
+    return hist
+
+
+def run_network_benchmark(concurrency: tuple = (1, 4, 16), duration: float = 1.0, buffer_size: int = 256 * 1024,
+                          message_size: int = 64, log_panel: None=None) -> dict:
+    """
+    Loopback TCP over 127.0.0.1 (no outside network): a threaded server, then for each
+    concurrency level N clients streaming buffer_size sends (bulk MB/s) and N clients doing
+    message_size request/response round trips (RTT percentiles). Filter drivers and broken
+    network stacks show up as low loopback throughput or slow round trips.
+    Returns {"rows": [...], "score": (score, detail)}.
+    """
+    _safe_log(log_panel, f"▶️ NET: loopback TCP at concurrency {', '.join(map(str, concurrency))}...")
+
+    result = {"rows": [], "score": (0.0, "")}
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+    try:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(max(concurrency) * 2)
+        address = listener.getsockname()
+        threading.Thread(target=_net_server, args=(listener, message_size, buffer_size), daemon=True).start()
+
+        reporter = _reporter()
+
+        for i, clients in enumerate(concurrency):
+            _checkpoint()
+
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                start = time.perf_counter()
+                received = sum(pool.map(lambda _: _net_bulk_client(address, buffer_size, duration), range(clients)))
+                bulk_mb_s = received / _MB / (time.perf_counter() - start)
+
+                _checkpoint()
+                hists = list(pool.map(lambda _: _net_echo_client(address, message_size, duration), range(clients)))
+
+            hist = LatencyHistogram()
+            for h in hists:
+                hist.merge(h)
+
+            latency = hist.summary()
+            row = {"clients": clients, "bulk_mb_s": round(bulk_mb_s, 1),
+                   "round_trips_s": round(hist.count / duration, 1), "latency": latency}
+            result["rows"].append(row)
+
+            if reporter:
+                reporter.emit("NET loopback", (i + 1) / len(concurrency), bulk_mb_s, "MB/s", i + 1)
+            _safe_log(log_panel, f"NET x{clients}: {bulk_mb_s:.0f} MB/s bulk, {row['round_trips_s']:.0f} round trips/s "
+                                 f"{_latency_detail(latency)}")
+
+    except Exception as e:
+        result["score"] = (0.0, f"error: {e}")
+        return result
+
+    finally:
+        listener.close()
+
+    # log scales: best bulk 100 MB/s -> 0, 10 GB/s -> 10; single-client p50 RTT 1 ms -> 0, 10 us -> 10
+    best = max(row["bulk_mb_s"] for row in result["rows"])
+    rtt_us = max(result["rows"][0]["latency"]["p50_us"], 1.0)
+    bulk_score = _normalize(math.log10(max(best, 1.0)), ref_min=2.0, ref_max=4.0)
+    rtt_score = 10.0 - _normalize(math.log10(rtt_us), ref_min=1.0, ref_max=3.0)
+
+    detail = " ".join(f"x{row['clients']}={row['bulk_mb_s']:.0f}MB/s" for row in result["rows"])
+    detail += f" RTT p50={result['rows'][0]['latency']['p50_us']:.1f}us p99={result['rows'][0]['latency']['p99_us']:.1f}us"
+    result["score"] = (round((bulk_score + rtt_score) / 2, 2), detail)
+    return result
+
+
+# ---------- RAM benchmark ----------
+
+def _stream_kernels_numpy(n: int) -> dict:
+    """
+    STREAM-style kernels over three preallocated float64 arrays of n elements.
+    Returns name -> (callable, bytes moved per call). Byte counts are the real traffic
+    of the numpy implementation (triad needs two ufunc passes, so it moves 5 arrays, not 3).
+    """
+    # np.full touches every page here, so first-touch faults stay out of the timings
+    a = np.full(n, 1.0)
+    b = np.full(n, 2.0)
+    c = np.full(n, 0.0)
+    q = 3.0
+    size = n * 8
+
+    return {
+        "copy": (lambda: np.copyto(c, a), 2 * size),
+        "scale": (lambda: np.multiply(c, q, out=b), 2 * size),
+        "add": (lambda: np.add(a, b, out=c), 3 * size),
+        "triad": (lambda: (np.multiply(c, q, out=a), np.add(a, b, out=a)), 5 * size),
+    }
+
+
+def _stream_kernels_bytes(n: int) -> dict:
+    """No-numpy fallback: bulk memoryview copy and a bytearray scan over n-byte buffers."""
+    a = bytearray(b"\x01") * n
+    c = bytearray(n)
+    src, dst = memoryview(a), memoryview(c)
+
+    def copy() -> None:
+        dst[:] = src
+
+    def read() -> None:
+        # memchr-backed scan for a byte that is never present
+        a.find(0)
+
+    return {
+        "copy": (copy, 2 * n),
+        "read": (read, n),
+    }
+
+
+def run_ram_benchmark(size_mb: int = 1024, log_panel: None=None, measure: dict | None = None,
+                      target: float | None = None) -> tuple[float, str]:
+    """
+    STREAM-like memory bandwidth suite (copy, scale, add, triad on float64 arrays).
+    `size_mb` is the total working set; buffers are allocated once and reused across repeats.
+    With `target` (seconds per sample) the working set is calibrated, using size_mb as the cap.
+    Returns score 0-10 (mean kernel bandwidth) and a per-kernel detail string.
+    """
+    # the buffers are the whole footprint; calibration probes stay below the cap
+    size_mb = _fit_memory(size_mb, lambda mb: mb * _MB, 8, log_panel, "RAM")
+
+    if target:
+        def probe(mb: int) -> float:
+            kernels = _stream_kernels_numpy(mb * _MB // 24) if _HAS_NUMPY else _stream_kernels_bytes(mb * _MB // 2)
+            # slowest kernel: triad (numpy) / copy (fallback)
+            kernel = kernels["triad" if _HAS_NUMPY else "copy"][0]
+            start = time.perf_counter()
+            kernel()
+            return time.perf_counter() - start
+
+        # never below 64 MB (short of a smaller memory budget), or the working set would fit in the LLC
+        size_mb = _calibrate(probe, 64, target, min(64, size_mb), size_mb)
+
+    _safe_log(log_panel, f"▶️ RAM: testing {size_mb} MB working set...")
+
+    try:
+        if _HAS_NUMPY:
+            kernels = _stream_kernels_numpy(size_mb * _MB // (3 * 8))
+        else:
+            # fallback: two bytearrays, bulk copy / scan
+            kernels = _stream_kernels_bytes(size_mb * _MB // 2)
+
+        results = {}
+        noisy = False
+
+        for name, (kernel, nbytes) in kernels.items():
+            def sample() -> float:
+                start = time.perf_counter()
+                kernel()
+                return nbytes / _MB / (time.perf_counter() - start)
+
+            stats = _measure(sample, measure, f"RAM {name}", "MB/s")
+            results[name] = stats["median"]
+            noisy = noisy or stats["noisy"]
+            _safe_log(log_panel, f"RAM {name}: {_stats_detail(stats, 'MB/s')}")
+
+        del kernels
+
+        mbps = sum(results.values()) / len(results)
+        score = _normalize(mbps, ref_min=2000.0, ref_max=40000.0)  # single-thread DDR3 laptop .. DDR5 desktop
+
+        detail = " ".join(f"{name}={value:.2f}MB/s" for name, value in results.items())
+        if noisy:
+            detail += " ⚠️ noisy"
+
+        return score, detail
+
+    except MemoryError:
+        return 0.0, "MemoryError"
+    except Exception as e:
+        return 0.0, f"error: {e}"
+
+
+# ---------- RAM latency benchmark ----------
+_CACHE_LINE = 64
+_LINE_SLOTS = _CACHE_LINE // 8  # int64 slots per cache line
+
+
+def _build_chase_chain(size_bytes: int):
+    """
+    Random single-cycle permutation over a buffer of ~size_bytes, one node per cache line.
+    Each node holds the index of the next node, so walking it is a chain of dependent loads.
+    Vectorized with numpy; the fallback shuffles a list and is only meant for small buffers.
+    """
+    nodes = max(2, size_bytes // _CACHE_LINE)
+
+    if _HAS_NUMPY:
+        # in place: one extra index array (size_bytes / 8) besides the chain, see _chase_chain_peak
+        order = np.random.permutation(nodes).astype(np.int64, copy=False)
+        order *= _LINE_SLOTS
+        chain = np.zeros(nodes * _LINE_SLOTS, dtype=np.int64)
+        chain[order[:-1]] = order[1:]
+        chain[order[-1]] = order[0]
+        return memoryview(chain)
+
+    order = list(range(0, nodes * _LINE_SLOTS, _LINE_SLOTS))
+    random.shuffle(order)
+    chain = array("q", bytes(nodes * _CACHE_LINE))
+    for src, dst in zip(order, order[1:] + order[:1]):
+        chain[src] = dst
+    return chain
+
+
+def _chase_chain_peak(size_bytes: int) -> int:
+    """Peak bytes while building a chain: the chain plus the shuffled order (list of ints without numpy)."""
+    return size_bytes * (9 if _HAS_NUMPY else 16) // 8
+
+
+def _chase(chain, steps: int) -> float:
+    """Walks `steps` dependent loads and returns ns per step (includes interpreter overhead)."""
+    i = 0
+    start = time.perf_counter()
+
+    for _ in range(steps):
+        i = chain[i]
+
+    return (time.perf_counter() - start) * 1e9 / steps
+
+
+def run_ram_latency_benchmark(size_mb: int = 256, steps: int = 1_000_000, log_panel: None=None,
+                              measure: dict | None = None, target: float | None = None) -> tuple[float, str]:
+    """
+    Pointer-chasing memory latency: walks a random cyclic chain spread over `size_mb`.
+    The per-step cost of the same loop over an L1-resident chain is subtracted, so the
+    result is the load latency in ns per access. With `target` (seconds per sample) the
+    number of steps is calibrated. Returns score 0-10 (lower latency = higher).
+    """
+    if not _HAS_NUMPY:
+        # list shuffle setup is slow, keep the fallback buffer small
+        size_mb = min(size_mb, 64)
+
+    size_mb = _fit_memory(size_mb, lambda mb: _chase_chain_peak(mb * _MB), 8, log_panel, "RAM latency")
+    _safe_log(log_panel, f"▶️ RAM: pointer-chasing latency over {size_mb} MB...")
+
+    try:
+        baseline_chain = _build_chase_chain(16 * 1024)
+        chain = _build_chase_chain(size_mb * _MB)
+
+        if target:
+            steps = _calibrate(lambda n: _chase(chain, n) * n / 1e9, 10_000, target, 10_000, 100_000_000)
+
+        baseline = _measure(lambda: _chase(baseline_chain, steps), measure, "RAM latency baseline", "ns/step")
+        loaded = _measure(lambda: _chase(chain, steps), measure, "RAM latency", "ns/step")
+
+        ns = max(loaded["median"] - baseline["median"], 0.0)
+        _safe_log(log_panel, f"RAM latency loop: {_stats_detail(loaded, 'ns/step')}, "
+                             f"L1 baseline {baseline['median']:.2f} ns/step")
+
+        # ~70 ns (tuned desktop) -> 10, ~250 ns (throttled / swapping laptop) -> 0
+        score = round(10.0 - _normalize(ns, ref_min=70.0, ref_max=250.0), 2)
+
+        detail = f"{ns:.2f} ns/access ({size_mb} MB chain)"
+        if loaded["noisy"] or baseline["noisy"]:
+            detail += " ⚠️ noisy"
+
+        return score, detail
+
+    except MemoryError:
+        return 0.0, "MemoryError"
+    except Exception as e:
+        return 0.0, f"error: {e}"
+
+
+# ---------- Allocation / page-fault benchmark ----------
+def _fault_counters() -> tuple[int, int | None]:
+    """(minor or total, major) page faults of this process so far; major is None where unknown."""
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_minflt, usage.ru_majflt
+    except ImportError:
+        pass
+
+    if _HAS_PSUTIL:
+        try:
+            return psutil.Process().memory_info().num_page_faults, None  # Windows: soft + hard
+        except Exception:
+            pass
+
+    return 0, None
+
+
+def _system_paging() -> tuple[int, int] | None:
+    """System-wide (pages swapped in, pages swapped out) so far; None where unknown."""
+    try:
+        with open("/proc/vmstat") as f:
+            counters = dict(line.split() for line in f)
+        return int(counters["pswpin"]), int(counters["pswpout"])
+    except (OSError, KeyError, ValueError):
+        pass
+
+    # psutil reports no swap traffic on Windows (always 0), which would read as "no paging"
+    if _HAS_PSUTIL and os.name != "nt":
+        try:
+            swap = psutil.swap_memory()
+            return swap.sin // mmap.PAGESIZE, swap.sout // mmap.PAGESIZE
+        except Exception:
+            pass
+
+    return None
+
+
+def _touch_pages(mv: memoryview, pages: int) -> None:
+    """Writes one byte per page (strided slice assignment, no Python loop)."""
+    mv[::mmap.PAGESIZE] = b"\x01" * pages
+
+
+def run_page_fault_benchmark(size_mb: int = 256, small_size: int = 4096, small_count: int = 20_000,
+                             large_mb: int = 512, pressure: bool = False, pressure_fraction: float = 0.9,
+                             log_panel: None=None, measure: dict | None = None) -> dict:
+    """
+    Separates allocation / page-fault cost from bandwidth:
+      - cold first touch of fresh anonymous mappings vs warm re-touch of the same pages (ns/page)
+      - small (small_size) vs large (size_mb) allocations including zero-fill
+      - large buffer: first touch and re-touch of one large_mb buffer, counting faults. It is capped
+        at the memory budget (by default half the available memory), so it does not create memory
+        pressure; it shows how fault cost scales with size (THP, zeroing), and major faults here
+        mean the machine was already paging.
+      - with pressure=True (opt-in, thorough preset): first touch of pressure_fraction of the
+        available memory, past the memory budget on purpose, reporting the fault rate (faults/s),
+        major faults/s and system-wide swap traffic while the machine reclaims and pages.
+    Returns the measurements plus a (score, detail) tuple: cold fault cost on a log scale
+    (100 ns/page -> 10, 10 us/page -> 0). The large-buffer and pressure passes are reported, not scored.
+    """
+    # one buffer (or batch of small ones) at a time: the largest of them is the peak
+    size_mb = _fit_memory(size_mb, lambda mb: mb * _MB, 1, log_panel, "RAM page faults")
+    small_count = _fit_memory(small_count, lambda count: count * small_size, 100, log_panel, "RAM small alloc")
+    if large_mb:
+        large_mb = _fit_memory(large_mb, lambda mb: mb * _MB, 1, log_panel, "RAM large first touch")
+    _safe_log(log_panel, f"▶️ RAM: allocation / page-fault cost ({size_mb} MB)...")
+
+    page = mmap.PAGESIZE
+    pages = size_mb * _MB // page
+    size = pages * page
+    opts = {"warmup": 1, "min_repeats": 3, "max_repeats": 10, "time_budget": 2.0, **(measure or {})}
+    result = {"page_size": page, "score": (0.0, "")}
+
+    try:
+        def cold_sample() -> float:
+            with mmap.mmap(-1, size) as m:
+                mv = memoryview(m)
+                start = time.perf_counter_ns()
+                _touch_pages(mv, pages)
+                elapsed = time.perf_counter_ns() - start
+                mv.release()
+            return elapsed / pages
+
+        cold = _measure(cold_sample, opts, "RAM first touch", "ns/page")
+
+        with mmap.mmap(-1, size) as m:
+            mv = memoryview(m)
+            _touch_pages(mv, pages)
+
+            def warm_sample() -> float:
+                start = time.perf_counter_ns()
+                _touch_pages(mv, pages)
+                return (time.perf_counter_ns() - start) / pages
+
+            warm = _measure(warm_sample, opts, "RAM re-touch", "ns/page")
+            mv.release()
+
+        def small_sample() -> float:
+            start = time.perf_counter_ns()
+            buffers = [bytearray(small_size) for _ in range(small_count)]
+            elapsed = time.perf_counter_ns() - start
+            del buffers
+            return elapsed / small_count
+
+        def large_sample() -> float:
+            start = time.perf_counter_ns()
+            buffer = bytearray(size)
+            elapsed = time.perf_counter_ns() - start
+            del buffer
+            return size / _MB / (elapsed / 1e9)
+
+        small = _measure(small_sample, opts, "RAM small alloc", "ns/alloc")
+        large = _measure(large_sample, opts, "RAM large alloc", "MB/s")
+
+        result.update({
+            "cold_ns_page": round(cold["median"], 1),
+            "warm_ns_page": round(warm["median"], 1),
+            "fault_ns": round(max(cold["median"] - warm["median"], 0.0), 1),
+            "small_alloc_ns": round(small["median"], 1),
+            "large_alloc_mb_s": round(large["median"], 1),
+            "large": None,
+            "pressure": None,
+        })
+        _safe_log(log_panel, f"RAM first touch: {_stats_detail(cold, 'ns/page')}; "
+                             f"re-touch: {_stats_detail(warm, 'ns/page')}")
+        _safe_log(log_panel, f"RAM alloc: {small_size} B {_stats_detail(small, 'ns/alloc')}; "
+                             f"{size_mb} MB {_stats_detail(large, 'MB/s')}")
+
+        available = _available_memory()
+        if large_mb and available:
+            large_pages = large_mb * _MB // page  # already within the memory budget
+            _checkpoint()
+
+            with mmap.mmap(-1, large_pages * page) as m:
+                mv = memoryview(m)
+                minor0, major0 = _fault_counters()
+                start = time.perf_counter_ns()
+                _touch_pages(mv, large_pages)
+                first = (time.perf_counter_ns() - start) / large_pages
+
+                _checkpoint()
+                start = time.perf_counter_ns()
+                _touch_pages(mv, large_pages)
+                again = (time.perf_counter_ns() - start) / large_pages
+                minor1, major1 = _fault_counters()
+                mv.release()
+
+            result["large"] = {
+                "mb": large_pages * page // _MB,
+                "available_mb": available // _MB,
+                "first_ns_page": round(first, 1),
+                "retouch_ns_page": round(again, 1),
+                "faults": minor1 - minor0,
+                "major_faults": major1 - major0 if major0 is not None else None,
+                # first-touch cost relative to the size_mb cold run
+                "vs_cold": round(first / cold["median"], 2) if cold["median"] > 0 else 0.0,
+            }
+            p = result["large"]
+            _safe_log(log_panel, f"RAM large first touch {p['mb']} MB of {p['available_mb']} MB available: "
+                                 f"first touch {first:.0f} ns/page (x{p['vs_cold']}), re-touch {again:.0f} ns/page, "
+                                 f"{p['faults']} faults" + (f", {p['major_faults']} major" if p["major_faults"] is not None else ""))
+
+        available = _available_memory()
+        if pressure and available:
+            pressure_pages = int(available * pressure_fraction) // page
+            chunk = 64 * _MB // page
+            # the only allocation allowed past the budget: declare it, so the run is held to it instead
+            _memory.declared = max(getattr(_memory, "declared", None) or 0, pressure_pages * page)
+            _safe_log(log_panel, f"▶️ RAM: memory pressure ({pressure_pages * page // _MB} MB of "
+                                 f"{available // _MB} MB available)...")
+            _checkpoint()
+
+            with mmap.mmap(-1, pressure_pages * page) as m:
+                mv = memoryview(m)
+                minor0, major0 = _fault_counters()
+                paging0 = _system_paging()
+                start = time.perf_counter_ns()
+                for offset in range(0, pressure_pages, chunk):
+                    _checkpoint()
+                    count = min(chunk, pressure_pages - offset)
+                    with mv[offset * page:(offset + count) * page] as part:
+                        _touch_pages(part, count)
+                elapsed = max((time.perf_counter_ns() - start) / 1e9, 1e-9)
+                minor1, major1 = _fault_counters()
+                paging1 = _system_paging()
+                mv.release()
+
+            faults = minor1 - minor0
+            major = major1 - major0 if major0 is not None else None
+            result["pressure"] = {
+                "mb": pressure_pages * page // _MB,
+                "available_mb": available // _MB,
+                "seconds": round(elapsed, 2),
+                "faults": faults,
+                "faults_s": round(faults / elapsed),
+                "major_faults": major,
+                "major_faults_s": round(major / elapsed, 1) if major is not None else None,
+                # whole machine, so other processes pushed out to make room count too
+                "swap_in_pages": paging1[0] - paging0[0] if paging0 and paging1 else None,
+                "swap_out_pages": paging1[1] - paging0[1] if paging0 and paging1 else None,
+            }
+            p = result["pressure"]
+            reporter = _reporter()
+            if reporter:
+                reporter.emit("RAM pressure", 1.0, p["faults_s"], "faults/s", 1)
+            _safe_log(log_panel, f"RAM pressure {p['mb']} MB in {p['seconds']} s: {p['faults_s']} faults/s"
+                                 + (f", {p['major_faults_s']} major faults/s" if major is not None else "")
+                                 + (f", swap in/out {p['swap_in_pages']}/{p['swap_out_pages']} pages"
+                                    if p["swap_in_pages"] is not None else ""))
+
+    except BenchmarkCancelled:
+        raise
+    except Exception as e:
+        result["score"] = (0.0, f"error: {e}")
+        return result
+
+    score = 10.0 - _normalize(math.log10(max(result["cold_ns_page"], 1.0)), ref_min=2.0, ref_max=4.0)
+    detail = (f"first touch {result['cold_ns_page']:.0f} ns/page vs re-touch {result['warm_ns_page']:.0f}, "
+              f"small alloc {result['small_alloc_ns']:.0f} ns, large alloc {result['large_alloc_mb_s']:.0f} MB/s")
+
+    p = result["large"]
+    if p:
+        detail += f", {p['mb']} MB first touch x{p['vs_cold']}"
+        if p["major_faults"]:
+            detail += f" ⚠️ {p['major_faults']} major faults (paging)"
+
+    p = result["pressure"]
+    if p:
+        detail += f", under pressure ({p['mb']} MB) {p['faults_s']} faults/s"
+        if p["major_faults_s"]:
+            detail += f", {p['major_faults_s']} major faults/s"
+        if p["swap_out_pages"]:
+            detail += f", {p['swap_out_pages'] * page // _MB} MB swapped out"
+
+    result["score"] = (round(score, 2), detail)
+    return result
+
+
+# ---------- Cache hierarchy sweep ----------
+SWEEP_MEASURE_DEFAULTS = {"min_repeats": 3, "max_repeats": 10, "time_budget": 0.5}
+
+
+def _sweep_sizes(min_kb: int, max_mb: int, factor: float) -> list[int]:
+    """Geometric working-set sizes in bytes from min_kb KiB to max_mb MiB."""
+    sizes = []
+    size = float(min_kb * 1024)
+    while size <= max_mb * _MB:
+        # keep sizes cache-line aligned and unique
+        aligned = int(size) // _CACHE_LINE * _CACHE_LINE
+        if not sizes or aligned != sizes[-1]:
+            sizes.append(aligned)
+        size *= factor
+    return sizes
+
+
+def _read_kernel(size_bytes: int):
+    """
+    Returns (callable, bytes read per call) scanning a size_bytes buffer enough times to be timeable.
+    Below ~64 KB the per-call overhead of sum()/find() dominates, so read figures there are a lower bound.
+    """
+    passes = max(1, (64 * _MB) // size_bytes)
+
+    if _HAS_NUMPY:
+        buf = np.full(size_bytes // 8, 1.0)
+
+        def read() -> None:
+            for _ in range(passes):
+                buf.sum()
+    else:
+        buf = bytearray(b"\x01") * size_bytes
+
+        def read() -> None:
+            for _ in range(passes):
+                buf.find(0)
+
+    return read, passes * size_bytes
+
+
+def _detect_plateaus(series: list[dict], jump: float = 1.5) -> list[dict]:
+    """
+    Groups consecutive sweep points with similar latency into plateaus.
+    A new plateau starts when latency exceeds `jump` times the current plateau's first point.
+    """
+    plateaus = []
+
+    for point in series:
+        latency = max(point["latency_ns"], 0.5)  # L1 hits net out to ~0 ns
+        if not plateaus or latency > plateaus[-1]["_base"] * jump:
+            plateaus.append({"from_kb": point["size_kb"], "to_kb": point["size_kb"], "_base": latency,
+                             "_lat": [], "_read": []})
+
+        plateau = plateaus[-1]
+        plateau["to_kb"] = point["size_kb"]
+        plateau["_lat"].append(point["latency_ns"])
+        plateau["_read"].append(point["read_mb_s"])
+
+    return [{
+        "from_kb": p["from_kb"],
+        "to_kb": p["to_kb"],
+        "latency_ns": round(sum(p["_lat"]) / len(p["_lat"]), 2),
+        "read_mb_s": round(sum(p["_read"]) / len(p["_read"]), 2),
+    } for p in plateaus]
+
+
+def run_cache_sweep(min_kb: int = 4, max_mb: int = 2048, factor: float = 2.0, steps: int = 200_000,
+                    log_panel: None=None, measure: dict | None = None) -> dict:
+    """
+    Runs the read and pointer-chasing kernels over geometric working sets (min_kb KiB .. max_mb MiB)
+    to expose the L1 / L2 / L3 / DRAM plateaus.
+    Returns {"series": [{"size_kb", "read_mb_s", "latency_ns", "noisy"}, ...], "plateaus": [...]},
+    plain JSON-serializable data for the UI and exports.
+    """
+    # sizes are measured one at a time; the largest chain is the peak
+    max_mb = _fit_memory(max_mb, lambda mb: _chase_chain_peak(mb * _MB), 1, log_panel, "RAM sweep")
+    _safe_log(log_panel, f"▶️ RAM: cache sweep {min_kb} KB .. {max_mb} MB (x{factor})...")
+
+    measure = {**SWEEP_MEASURE_DEFAULTS, **(measure or {})}
+    series = []
+
+    try:
+        baseline_chain = _build_chase_chain(16 * 1024)
+        baseline = _measure(lambda: _chase(baseline_chain, steps), measure, "RAM sweep baseline", "ns/step")["median"]
+
+        for size in _sweep_sizes(min_kb, max_mb, factor):
+            read, nbytes = _read_kernel(size)
+
+            def read_sample() -> float:
+                start = time.perf_counter()
+                read()
+                return nbytes / _MB / (time.perf_counter() - start)
+
+            read_stats = _measure(read_sample, measure, f"RAM sweep {size // 1024} KB read", "MB/s")
+            read = None  # release the buffer before the chain is built; read_sample is done with it
+
+            chain = _build_chase_chain(size)
+            lat_stats = _measure(lambda: _chase(chain, steps), measure, f"RAM sweep {size // 1024} KB latency", "ns/step")
+            chain = None
+
+            point = {
+                "size_kb": size // 1024,
+                "read_mb_s": round(read_stats["median"], 2),
+                "latency_ns": round(max(lat_stats["median"] - baseline, 0.0), 2),
+                "noisy": read_stats["noisy"] or lat_stats["noisy"],
+            }
+            series.append(point)
+            _safe_log(log_panel, f"RAM sweep {point['size_kb']} KB: {point['read_mb_s']:.2f} MB/s, "
+                                 f"{point['latency_ns']:.2f} ns")
+
+    except MemoryError:
+        _safe_log(log_panel, f"RAM sweep stopped: MemoryError after {len(series)} sizes")
+
+    return {"series": series, "plateaus": _detect_plateaus(series)}
+
+
+# ---------- Random 4K IOPS benchmark ----------
+QUEUE_DEPTHS = (1, 4, 16, 32)
+IO_MEASURE_DEFAULTS = {"warmup": 1, "min_repeats": 3, "max_repeats": 5, "time_budget": 3.0}
+_HAS_PVIO = hasattr(os, "preadv") and hasattr(os, "pwritev")
+
+
+def _open_no_buffering(path: str) -> int | None:
+    """
+    Windows: opens path with CreateFileW(FILE_FLAG_NO_BUFFERING) and wraps the handle in a CRT fd,
+    so os.lseek / os.write / os.close work on it. None when the volume refuses unbuffered handles.
+    """
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    GENERIC_READ, GENERIC_WRITE = 0x80000000, 0x40000000
+    FILE_SHARE_READ, FILE_SHARE_WRITE = 0x1, 0x2
+    OPEN_EXISTING = 3
+    FILE_FLAG_NO_BUFFERING, FILE_FLAG_RANDOM_ACCESS = 0x20000000, 0x10000000
+    INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.CreateFileW.argtypes = (wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                     wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE)
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    handle = kernel32.CreateFileW(path, GENERIC_READ | GENERIC_WRITE, FILE_SHARE_READ | FILE_SHARE_WRITE, None,
+                                  OPEN_EXISTING, FILE_FLAG_NO_BUFFERING | FILE_FLAG_RANDOM_ACCESS, None)
+    if handle in (None, INVALID_HANDLE_VALUE):
+        return None
+
+    try:
+        return msvcrt.open_osfhandle(handle, os.O_RDWR | os.O_BINARY)
+    except OSError:
+        kernel32.CloseHandle(handle)
+        return None
+
+
+def _open_unbuffered(path: str) -> tuple[int, bool]:
+    """
+    Opens path read/write bypassing the page cache where the platform allows it
+    (O_DIRECT on Linux, FILE_FLAG_NO_BUFFERING on Windows, F_NOCACHE on macOS). Returns (fd, direct).
+    Unbuffered fds need block-aligned offsets and buffers; use _block_io with an mmap buffer.
+    """
+    flags = os.O_RDWR | getattr(os, "O_BINARY", 0)
+
+    if hasattr(os, "O_DIRECT") and _HAS_PVIO:
+        try:
+            return os.open(path, flags | os.O_DIRECT), True
+        except OSError:
+            pass  # e.g. tmpfs does not support O_DIRECT
+
+    if os.name == "nt":
+        try:
+            fd = _open_no_buffering(path)
+        except (ImportError, AttributeError, OSError):
+            fd = None
+        if fd is not None:
+            return fd, True
+
+    # O_RANDOM is a Windows cache hint; 0 elsewhere
+    fd = os.open(path, flags | getattr(os, "O_RANDOM", 0))
+
+    try:
+        import fcntl
+        if hasattr(fcntl, "F_NOCACHE"):
+            fcntl.fcntl(fd, fcntl.F_NOCACHE, 1)
+            return fd, True
+    except ImportError:
+        pass
+
+    return fd, False
+
+
+def _block_io(fd: int, buf, offset: int, write: bool) -> None:
+    """One read into / write from the page-aligned `buf` at `offset`."""
+    if _HAS_PVIO:
+        if write:
+            os.pwritev(fd, [buf], offset)
+        else:
+            os.preadv(fd, [buf], offset)
+        return
+
+    os.lseek(fd, offset, os.SEEK_SET)
+    if write:
+        os.write(fd, buf)
+    else:
+        # os.read would allocate an unaligned buffer, which FILE_FLAG_NO_BUFFERING handles reject
+        with open(fd, "rb", buffering=0, closefd=False) as f:
+            f.readinto(buf)
+
+
+def _io_worker(fd: int, write: bool, blocks: int, block_size: int,
+               deadline: float) -> tuple[int, LatencyHistogram]:
+    """
+    One outstanding I/O slot: issues block_size reads or writes at random aligned offsets
+    until `deadline`. Each slot owns its fd, so the seek+read fallback (Windows) is race-free.
+    Returns the number of completed operations and their latency histogram.
+    """
+    rng = random.Random()
+    hist = LatencyHistogram()
+    buf = mmap.mmap(-1, block_size)  # page-aligned, as O_DIRECT requires
+    if write:
+        buf.write(os.urandom(block_size))
+
+    ops = 0
+
+    try:
+        while time.perf_counter() < deadline:
+            offset = rng.randrange(blocks) * block_size
+            t0 = time.perf_counter_ns()
+            _block_io(fd, buf, offset, write)
+            hist.record(time.perf_counter_ns() - t0)
+            ops += 1
+    finally:
+        buf.close()
+
+    return ops, hist
+
+
+def _random_io(file_path: str, file_size: int, queue_depths: tuple = QUEUE_DEPTHS, block_size: int = 4096,
+               window: float = 0.25, log_panel: None=None, measure: dict | None = None) -> dict:
+    """
+    Random block_size reads, then writes, over an existing file for each queue depth.
+    Queue depth N = N threads, each keeping one synchronous I/O in flight.
+    Returns {"direct": bool, "read": {qd: iops}, "write": {qd: iops}, "noisy": bool,
+             "latency": {"read": {qd: summary}, "write": {qd: summary}}}.
+    """
+    measure = {**IO_MEASURE_DEFAULTS, **(measure or {})}
+    blocks = max(1, file_size // block_size)
+    result = {"direct": True, "read": {}, "write": {}, "noisy": False,
+              "latency": {"read": {}, "write": {}}}
+
+    for mode in ("read", "write"):
+        for qd in queue_depths:
+            opened = [_open_unbuffered(file_path) for _ in range(qd)]
+            fds = [fd for fd, _ in opened]
+            result["direct"] = result["direct"] and all(direct for _, direct in opened)
+
+            histograms = []
+
+            try:
+                with ThreadPoolExecutor(max_workers=qd) as pool:
+                    def sample() -> float:
+                        start = time.perf_counter()
+                        deadline = start + window
+                        futures = [pool.submit(_io_worker, fd, mode == "write", blocks, block_size, deadline)
+                                   for fd in fds]
+
+                        ops = 0
+                        hist = LatencyHistogram()
+                        for future in futures:
+                            n, worker_hist = future.result()
+                            ops += n
+                            hist.merge(worker_hist)
+
+                        histograms.append(hist)
+                        return ops / (time.perf_counter() - start)
+
+                    stats = _measure(sample, measure, f"DISK random {block_size // 1024}K {mode} QD{qd}", "IOPS")
+            finally:
+                for fd in fds:
+                    os.close(fd)
+
+            latency = _merge_last(histograms, stats["samples"]).summary()
+            result[mode][qd] = round(stats["median"], 2)
+            result["latency"][mode][qd] = latency
+            result["noisy"] = result["noisy"] or stats["noisy"]
+            _safe_log(log_panel, f"DISK random {block_size // 1024}K {mode} QD{qd}: {_stats_detail(stats, 'IOPS')}")
+            _safe_log(log_panel, f"DISK random {block_size // 1024}K {mode} QD{qd} latency: {_latency_detail(latency)}")
+
+    return result
+
+
+def _random_io_score(result: dict) -> float | None:
+    """
+    Mean log-scale IOPS score over all modes / queue depths: 100 IOPS (HDD) -> 0, 100k IOPS -> 10.
+    None when the I/O went through the page cache: the file was just written, so buffered random
+    reads are cache hits and would score RAM, not the disk.
+    """
+    if not result["direct"]:
+        return None
+
+    values = list(result["read"].values()) + list(result["write"].values())
+    if not values:
+        return 0.0
+
+    scores = [_normalize(math.log10(max(iops, 1.0)), ref_min=2.0, ref_max=5.0) for iops in values]
+    return round(sum(scores) / len(scores), 2)
+
+
+def _random_io_detail(result: dict) -> str:
+    read = " ".join(f"QD{qd}={iops:.0f}" for qd, iops in result["read"].items())
+    write = " ".join(f"QD{qd}={iops:.0f}" for qd, iops in result["write"].items())
+    detail = f"rand4k_read[{read}] rand4k_write[{write}] IOPS"
+
+    qd1_read = result["latency"]["read"].get(1)
+    if qd1_read:
+        detail += f" QD1_read_p99={qd1_read['p99_us']:.1f}us"
+
+    if not result["direct"]:
+        detail += " (buffered: page-cache hits, not scored)"
+
+    return detail
+
+
+def run_random_io_benchmark(size_mb: int = 256, queue_depths: tuple = QUEUE_DEPTHS, log_panel: None=None,
+                            measure: dict | None = None) -> tuple[float, str]:
+    """
+    Standalone random 4K IOPS test on a fresh size_mb temp file.
+    Returns score 0-10 and detail string with IOPS per queue depth.
+    """
+    _safe_log(log_panel, f"▶️ DISK: random 4K IOPS over {size_mb} MB...")
+
+    tmp_dir = tempfile.mkdtemp()
+    file_path = os.path.join(tmp_dir, "disk_random.bin")
+
+    try:
+        block = os.urandom(_MB)
+
+        with open(file_path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(block)
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        result = _random_io(file_path, size_mb * _MB, queue_depths, log_panel=log_panel, measure=measure)
+        detail = _random_io_detail(result)
+
+        if result["noisy"]:
+            detail += " ⚠️ noisy"
+
+        return _random_io_score(result) or 0.0, detail
+
+    except Exception as e:
+        return 0.0, f"error: {e}"
+
+    finally:
+        try:
+            shutil.rmtree(tmp_dir)
+        except Exception:
+            pass
+
+
+# ---------- Memory-mapped read benchmark ----------
+def _mmap_touch(file_path: str, pages=None) -> int:
+    """
+    Maps file_path read-only and reads one byte per page: every page in order when
+    `pages` is None, otherwise the given page numbers. Bytes are read in place (numpy view
+    or mmap indexing), never copied into bytes objects. Returns the number of pages touched.
+    """
+    page = mmap.PAGESIZE
+
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        if _HAS_NUMPY:
+            view = np.frombuffer(m, dtype=np.uint8)
+            touched = view[::page] if pages is None else view[pages * page]
+            count = len(touched)
+            int(touched.sum())
+            # views must be released before the mapping can close
+            del view, touched
+            return count
+
+        offsets = range(0, len(m), page) if pages is None else (p * page for p in pages)
+        count = 0
+        for offset in offsets:
+            m[offset]
+            count += 1
+
+        return count
+
+
+def _mmap_read(file_path: str, file_size: int, random_pages: int = 8192, measure: dict | None = None) -> dict:
+    """
+    Sequential and random page touches through a fresh mapping per sample (so every sample
+    pays the page-fault / mapping cost again). Returns seq MB/s, random pages/s and a noisy flag.
+    """
+    total_pages = max(1, file_size // mmap.PAGESIZE)
+
+    def seq_sample() -> float:
+        start = time.perf_counter()
+        touched = _mmap_touch(file_path)
+        return touched * mmap.PAGESIZE / _MB / (time.perf_counter() - start)
+
+    def rand_sample() -> float:
+        if _HAS_NUMPY:
+            pages = np.random.randint(0, total_pages, size=random_pages)
+        else:
+            pages = [random.randrange(total_pages) for _ in range(random_pages)]
+
+        start = time.perf_counter()
+        touched = _mmap_touch(file_path, pages)
+        return touched / (time.perf_counter() - start)
+
+    seq_stats = _measure(seq_sample, measure, "DISK mmap seq read", "MB/s")
+    rand_stats = _measure(rand_sample, measure, "DISK mmap random read", "pages/s")
+
+    return {
+        "seq_mb_s": round(seq_stats["median"], 2),
+        "rand_pages_s": round(rand_stats["median"], 2),
+        "seq_stats": seq_stats,
+        "rand_stats": rand_stats,
+        "noisy": seq_stats["noisy"] or rand_stats["noisy"],
+    }
+
+
+# ---------- Commit (fsync) latency benchmark ----------
+def run_commit_latency_benchmark(directory: str | None = None, write_size: int = 4096, max_commits: int = 500,
+                                 time_budget: float = 3.0, log_panel: None=None) -> tuple[float, str]:
+    """
+    Database-style commit latency: append a small record, then os.fsync, repeated.
+    Every commit is recorded in a LatencyHistogram. Returns score 0-10 (from p99) and
+    a detail string with p50 / p99 / p99.9 / max and commits per second.
+    """
+    _safe_log(log_panel, f"▶️ DISK: fsync commit latency ({write_size} B records)...")
+
+    tmp_dir = None
+    record = os.urandom(write_size)
+    hist = LatencyHistogram()
+
+    try:
+        # inside the try: a missing or read-only target is an error result, not an exception
+        tmp_dir = tempfile.mkdtemp(dir=directory)
+        file_path = os.path.join(tmp_dir, "commit_test.log")
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0))
+
+        try:
+            # warm-up commit: file creation and first metadata update are not representative
+            os.write(fd, record)
+            os.fsync(fd)
+
+            start = time.perf_counter()
+            while hist.count < max_commits and time.perf_counter() - start < time_budget:
+                _checkpoint()
+                t0 = time.perf_counter_ns()
+                os.write(fd, record)
+                os.fsync(fd)
+                hist.record(time.perf_counter_ns() - t0)
+
+            elapsed = time.perf_counter() - start
+        finally:
+            os.close(fd)
+
+        latency = hist.summary()
+        commits_s = hist.count / elapsed if elapsed > 0 else 0.0
+
+        reporter = _reporter()
+        if reporter:
+            reporter.emit("DISK commit", 1.0, commits_s, "commits/s", 1)
+
+        # log scale on p99: 100 us (NVMe with PLP) -> 10, 50 ms (struggling HDD / SMR) -> 0
+        p99_us = max(latency["p99_us"], 1.0)
+        score = round(10.0 - _normalize(math.log10(p99_us), ref_min=2.0, ref_max=math.log10(50_000)), 2)
+
+        detail = f"{commits_s:.0f} commits/s {_latency_detail(latency)}"
+        _safe_log(log_panel, f"DISK commit latency: {detail}")
+
+        return score, detail
+
+    except Exception as e:
+        return 0.0, f"error: {e}"
+
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# ---------- Small-file metadata benchmark ----------
+METADATA_OPS = ("create", "stat", "rename", "delete")
+
+
+def _metadata_op(op: str, paths: list[str], payload: bytes) -> None:
+    """Runs one metadata operation over every path (one worker's share)."""
+    if op == "create":
+        for path in paths:
+            with open(path, "wb") as f:
+                f.write(payload)
+    elif op == "stat":
+        for path in paths:
+            os.stat(path)
+    elif op == "rename":
+        for path in paths:
+            os.rename(path, path + ".old")
+    elif op == "delete":
+        for path in paths:
+            os.remove(path + ".old")
+
+
+def _metadata_pass(root: str, files: int, fanout: int, payload: bytes, workers: int) -> dict:
+    """
+    Creates, stats, renames and deletes `files` small files spread over a fanout x fanout
+    directory tree. Directories are created outside the timings. workers > 1 splits every
+    phase across a thread pool. Returns ops/sec per operation.
+    """
+    dirs = [os.path.join(root, f"d{i:03d}", f"d{j:03d}") for i in range(fanout) for j in range(fanout)]
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    paths = [os.path.join(dirs[i % len(dirs)], f"f{i:06d}.tmp") for i in range(files)]
+    chunks = [paths[i::workers] for i in range(workers)]
+    result = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for op in METADATA_OPS:
+            _checkpoint()
+            start = time.perf_counter()
+            if workers == 1:
+                _metadata_op(op, paths, payload)
+            else:
+                list(pool.map(_metadata_op, [op] * workers, chunks, [payload] * workers))
+            elapsed = time.perf_counter() - start
+            result[op] = round(files / elapsed, 2) if elapsed > 0 else 0.0
+
+    shutil.rmtree(root, ignore_errors=True)
+    return result
+
+
+def run_metadata_benchmark(files: int = 20_000, fanout: int = 16, file_size: int = 512, workers: int = 8,
+                           directory: str | None = None, log_panel: None=None) -> tuple[float, str]:
+    """
+    Filesystem metadata benchmark: create / stat / rename / delete of many tiny files in
+    nested directories, single-threaded and with a `workers` thread pool, so the gain from
+    parallel deletion (as in clean_temporary_files) is visible per storage type.
+    Each phase is one timed pass over all files. Returns score 0-10 (single-threaded) and detail.
+    """
+    _safe_log(log_panel, f"▶️ DISK: metadata test with {files} files ({workers} workers)...")
+
+    tmp_dir = None
+    payload = os.urandom(file_size)
+
+    try:
+        tmp_dir = tempfile.mkdtemp(dir=directory)
+        single = _metadata_pass(os.path.join(tmp_dir, "single"), files, fanout, payload, 1)
+        parallel = _metadata_pass(os.path.join(tmp_dir, "parallel"), files, fanout, payload, workers)
+
+        for op in METADATA_OPS:
+            speedup = parallel[op] / single[op] if single[op] > 0 else 0.0
+            _safe_log(log_panel, f"DISK metadata {op}: {single[op]:.0f} ops/s single, "
+                                 f"{parallel[op]:.0f} ops/s x{workers} ({speedup:.2f}x)")
+
+        # log scale on the mean single-threaded rate: ~300 ops/s -> 0, 100k ops/s -> 10
+        mean_ops = sum(single.values()) / len(single)
+        score = _normalize(math.log10(max(mean_ops, 1.0)), ref_min=2.5, ref_max=5.0)
+
+        detail = " ".join(f"{op}={single[op]:.0f}/{parallel[op]:.0f}" for op in METADATA_OPS)
+        detail += f" ops/s (single/x{workers})"
+
+        return score, detail
+
+    except Exception as e:
+        return 0.0, f"error: {e}"
+
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# ---------- Disk benchmark ----------
+# Disk samples are expensive (each one rewrites / rereads the whole file), so sample less
+DISK_MEASURE_DEFAULTS = {"warmup": 0, "min_repeats": 3, "max_repeats": 5, "time_budget": 10.0}
+
+
+def run_disk_benchmark(size_mb: int = 500, log_panel: None=None, measure: dict | None = None,
+                       directory: str | None = None, target: float | None = None,
+                       queue_depths: tuple = QUEUE_DEPTHS, io_window: float = 0.25) -> tuple[float, str]:
+    """
+    Sequential write/read (buffered and memory-mapped) plus random 4K IOPS at several queue depths.
+    Returns score 0-10 (half sequential, half random 4K; sequential only where the volume can't do
+    unbuffered I/O) and detail string; mmap figures are reported for comparison only.
+    `directory` selects the volume under test (default: temp dir).
+    With `target` (seconds per sequential pass) the file size is calibrated, using size_mb as the cap.
+    """
+    _safe_log(log_panel, f"▶️ DISK: testing {size_mb} MB sequential write/read in {directory or tempfile.gettempdir()}...")
+
+    tmp_dir = None
+    measure = {**DISK_MEASURE_DEFAULTS, **(measure or {})}
+
+    try:
+        tmp_dir = tempfile.mkdtemp(dir=directory)
+        file_path = os.path.join(tmp_dir, "disk_test.bin")
+        block = os.urandom(1024 * 1024)  # 1MB block
+
+        if target:
+            def probe(mb: int) -> float:
+                start = time.perf_counter()
+                with open(file_path, "wb") as f:
+                    for _ in range(mb):
+                        f.write(block)
+                    f.flush()
+                    os.fsync(f.fileno())
+                return time.perf_counter() - start
+
+            size_mb = _calibrate(probe, 16, target, 16, size_mb)
+            _safe_log(log_panel, f"DISK: calibrated test file to {size_mb} MB")
+
+        # Write (every 1MB write and the final fsync are recorded as one I/O each)
+        write_hists = []
+
+        def write_sample() -> float:
+            hist = LatencyHistogram()
+            start = time.perf_counter()
+
+            with open(file_path, "wb") as f:
+                for _ in range(size_mb):
+                    t0 = time.perf_counter_ns()
+                    f.write(block)
+                    hist.record(time.perf_counter_ns() - t0)
+
+                t0 = time.perf_counter_ns()
+                f.flush()
+                os.fsync(f.fileno())
+                hist.record(time.perf_counter_ns() - t0)
+
+            write_time = time.perf_counter() - start
+            write_hists.append(hist)
+            return size_mb / write_time if write_time > 0 else 0.0
+
+        write_stats = _measure(write_sample, measure, "DISK seq write", "MB/s")
+        write_mb_s = write_stats["median"]
+        _safe_log(log_panel, f"DISK write: {_stats_detail(write_stats, 'MB/s')}")
+        _safe_log(log_panel, f"DISK write latency: {_latency_detail(_merge_last(write_hists, write_stats['samples']).summary())}")
+
+        # Read sequential
+        read_hists = []
+
+        def read_sample() -> float:
+            hist = LatencyHistogram()
+            start = time.perf_counter()
+
+            with open(file_path, "rb") as f:
+                while True:
+                    t0 = time.perf_counter_ns()
+                    chunk = f.read(1024 * 1024)
+                    hist.record(time.perf_counter_ns() - t0)
+                    if not chunk:
+                        break
+
+            read_time = time.perf_counter() - start
+            read_hists.append(hist)
+            return size_mb / read_time if read_time > 0 else 0.0
+
+        read_stats = _measure(read_sample, measure, "DISK seq read", "MB/s")
+        read_mb_s = read_stats["median"]
+        _safe_log(log_panel, f"DISK read: {_stats_detail(read_stats, 'MB/s')}")
+        _safe_log(log_panel, f"DISK read latency: {_latency_detail(_merge_last(read_hists, read_stats['samples']).summary())}")
+
+        # memory-mapped reads vs the buffered f.read path (page-cache / mapping overhead)
+        mapped = _mmap_read(file_path, size_mb * _MB, measure=measure)
+        mmap_ratio = mapped["seq_mb_s"] / read_mb_s if read_mb_s > 0 else 0.0
+        _safe_log(log_panel, f"DISK mmap seq read: {_stats_detail(mapped['seq_stats'], 'MB/s')} "
+                             f"({mmap_ratio:.2f}x buffered)")
+        _safe_log(log_panel, f"DISK mmap random read: {_stats_detail(mapped['rand_stats'], 'pages/s')}")
+
+        # random 4K IOPS at several queue depths
+        rand = _random_io(file_path, size_mb * _MB, queue_depths, window=io_window,
+                          log_panel=log_panel, measure=measure)
+        rand_score = _random_io_score(rand)
+
+        # normalize using read/write averages (tune refs per expectations)
+        metric = (write_mb_s * 0.55) + (read_mb_s * 0.45)
+        seq_score = _normalize(metric, ref_min=20.0, ref_max=2000.0)
+
+        # no unbuffered I/O on this volume: the score is sequential only
+        score = round(seq_score if rand_score is None else seq_score * 0.5 + rand_score * 0.5, 2)
+        detail = (f"seq_write={write_mb_s:.2f}MB/s seq_read={read_mb_s:.2f}MB/s "
+                  f"mmap_seq_read={mapped['seq_mb_s']:.2f}MB/s ({mmap_ratio:.2f}x) "
+                  f"mmap_rand={mapped['rand_pages_s']:.0f}pages/s {_random_io_detail(rand)}")
+
+        if write_stats["noisy"] or read_stats["noisy"] or mapped["noisy"] or rand["noisy"]:
+            detail += " ⚠️ noisy"
+
+        return score, detail
+
+    except Exception as e:
+        return 0.0, f"error: {e}"
+
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# ---------- Multi-volume disk suite ----------
+def list_volumes() -> list[str]:
+    """Mount points / drive roots of local, writable, fixed volumes."""
+    return [volume for volume in _local_volumes() if os.access(_volume_work_dir(volume), os.W_OK)]
+
+
+def _local_volumes() -> list[str]:
+    """Mount points / drive roots of local fixed volumes not mounted read-only."""
+    if _HAS_PSUTIL:
+        return [p.mountpoint for p in psutil.disk_partitions(all=False)
+                if "ro" not in p.opts.split(",") and "cdrom" not in p.opts
+                and not p.device.startswith("/dev/loop")]
+
+    if os.name == "nt":
+        import ctypes
+        import string
+
+        kernel32 = ctypes.windll.kernel32
+        mask = kernel32.GetLogicalDrives()
+        DRIVE_FIXED = 3
+
+        return [f"{letter}:\\" for i, letter in enumerate(string.ascii_uppercase)
+                if mask & (1 << i) and kernel32.GetDriveTypeW(f"{letter}:\\") == DRIVE_FIXED]
+
+    volumes, seen = [], set()
+
+    try:
+        with open("/proc/mounts") as f:
+            for line in f:
+                device, mount, _, opts = line.split()[:4]
+
+                if (not device.startswith("/dev/") or device.startswith("/dev/loop")
+                        or "ro" in opts.split(",") or device in seen):
+                    continue
+
+                seen.add(device)
+                volumes.append(mount.replace("\\040", " "))
+    except OSError:
+        volumes.append("/")
+
+    return volumes
+
+
+def _volume_work_dir(volume: str) -> str:
+    """Temp dir when it lives on `volume` (system drive roots are usually not writable), else the volume itself."""
+    tmp = tempfile.gettempdir()
+
+    try:
+        if os.stat(tmp).st_dev == os.stat(volume).st_dev:
+            return tmp
+    except OSError:
+        pass
+
+    return volume
+
+
+def run_disk_suite(targets: list[str] | None = None, concurrent: bool = False, size_mb: int = 500,
+                   log_panel: None=None, measure: dict | None = None, **kwargs) -> dict:
+    """
+    Runs run_disk_benchmark on every target directory (default: all local volumes from list_volumes()).
+    Targets run one after another for isolation; concurrent=True runs them at the same time to
+    expose controller / bus contention. Extra kwargs go to run_disk_benchmark.
+    Returns {target: (score, detail)}.
+    """
+    if targets is None:
+        targets = [_volume_work_dir(v) for v in list_volumes()]
+        if not targets:
+            _safe_log(log_panel, "⚠️ DISK: no writable local volume found")
+
+    mode = "concurrently" if concurrent else "sequentially"
+    _safe_log(log_panel, f"▶️ DISK: benchmarking {len(targets)} volume(s) {mode}: {', '.join(targets)}")
+
+    reporter = _reporter()
+
+    def bench(target: str) -> tuple[float, str]:
+        # pool threads don't inherit the caller's reporter
+        with reporting(reporter):
+            return run_disk_benchmark(size_mb=size_mb, log_panel=log_panel, measure=measure, directory=target, **kwargs)
+
+    if concurrent and len(targets) > 1:
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            results = dict(zip(targets, pool.map(bench, targets)))
+    else:
+        results = {target: bench(target) for target in targets}
+
+    for target, (score, detail) in results.items():
+        _safe_log(log_panel, f"DISK [{target}]: {score}/10 — {detail}")
+
+    return results
+
+
+# ---------- Whole-system stress ----------
+def _stress_bodies(work_dir: str, memory_mb: int, file_mb: int, block_size: int = 256 * 1024) -> dict:
+    """
+    One unit of work per stressor, each returning the MB it processed: sha256 batches on every
+    core, a bulk RAM copy of memory_mb, and mixed random reads/writes on a file_mb file that
+    bypasses the page cache where possible. All of them release the GIL, so plain threads
+    load the machine. Returns {name: (bodies, cleanup)}; CPU has one body per core.
+    """
+    cores = os.cpu_count() or 1
+
+    def cpu_body() -> float:
+        _cpu_kernel_hash(4)
+        return 4.0
+
+    if _HAS_NUMPY:
+        src, dst = np.full(memory_mb * _MB // 8, 1.0), np.zeros(memory_mb * _MB // 8)
+        copy = lambda: np.copyto(dst, src)
+    else:
+        copy = _stream_kernels_bytes(memory_mb * _MB)["copy"][0]
+
+    def memory_body() -> float:
+        copy()
+        return 2.0 * memory_mb
+
+    file_path = os.path.join(work_dir, "stress.bin")
+    chunk = os.urandom(_MB)
+    with open(file_path, "wb") as f:
+        for _ in range(file_mb):
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+
+    fd, _ = _open_unbuffered(file_path)
+    buf = mmap.mmap(-1, block_size)  # page-aligned, as O_DIRECT requires
+    buf.write(chunk[:block_size])
+    blocks = file_mb * _MB // block_size
+    rng = random.Random()
+    lock = threading.Lock()
+
+    def disk_body() -> float:
+        offset = rng.randrange(blocks) * block_size
+        with lock:
+            _block_io(fd, buf, offset, rng.random() < 0.5)
+        return block_size / _MB
+
+    def close_disk() -> None:
+        os.close(fd)
+        buf.close()
+
+    return {
+        "CPU": ([cpu_body] * cores, None),
+        "Memory": ([memory_body], None),
+        "Disk": ([disk_body], close_disk),
+    }
+
+
+def _stress_run(stressors: dict, duration: float, window: float, phase: str,
+                progress: tuple[float, float] = (0.0, 1.0)) -> dict:
+    """
+    Runs every body of every stressor in its own thread for `duration` seconds. Each finished
+    unit is credited to the window it completed in. A failing body is counted as an error and
+    retried; after 10 consecutive errors that thread stops. `progress` is the (start, span)
+    share of the benchmark's progress bar this run covers.
+    Returns {name: {"throughput" (MB/s per window), "errors", "error"}}.
+    """
+    windows = max(int(duration / window), 1)
+    state = {name: {"work": [0.0] * windows, "errors": 0, "error": ""} for name in stressors}
+    stop = threading.Event()
+    lock = threading.Lock()
+    reporter = _reporter()
+    start = time.perf_counter()
+
+    def loop(name: str, body) -> None:
+        entry = state[name]
+        failures = 0
+
+        while not stop.is_set():
+            try:
+                amount = body()
+                failures = 0
+            except Exception as e:
+                with lock:
+                    entry["errors"] += 1
+                    entry["error"] = entry["error"] or str(e)
+                failures += 1
+                if failures >= 10:
+                    return
+                time.sleep(0.01)
+                continue
+
+            slot = int((time.perf_counter() - start) / window)
+            if slot < windows:
+                with lock:
+                    entry["work"][slot] += amount
+
+    threads = [threading.Thread(target=loop, args=(name, body), daemon=True)
+               for name, (bodies, _) in stressors.items() for body in bodies]
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        for i in range(windows):
+            while time.perf_counter() < start + (i + 1) * window:
+                if reporter:
+                    reporter.check()
+                time.sleep(min(0.05, window))
+
+            if reporter:
+                total = sum(entry["work"][i] for entry in state.values()) / window
+                reporter.emit(phase, progress[0] + progress[1] * (i + 1) / windows, total, "MB/s", i + 1)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    return {name: {"throughput": [w / window for w in entry["work"]],
+                   "errors": entry["errors"], "error": entry["error"]}
+            for name, entry in state.items()}
+
+
+def run_stress_test(duration: float = 120.0, window: float = 1.0, isolated: float = 10.0,
+                    memory_mb: int = 256, file_mb: int = 256, directory: str | None = None,
+                    log_panel: None=None) -> dict:
+    """
+    Runs the CPU, memory and disk stressors together for `duration` seconds, after measuring each
+    one alone for `isolated` seconds. The sequential suite never shows contention (disk I/O
+    starving while every core is busy, bandwidth collapsing under mixed load); this does.
+    Per stressor it reports the isolated and combined throughput (MB/s), the interference ratio
+    (combined / isolated), errors, and stalled windows (throughput under 5% of isolated).
+    Returns a dict with "stressors" and a (score, detail) tuple; the score maps the mean
+    interference ratio (0.25 -> 0, 1.0 -> 10) and is zeroed by errors.
+    """
+    # the memory stressor copies between two memory_mb buffers
+    memory_mb = _fit_memory(memory_mb, lambda mb: 2 * mb * _MB, 1, log_panel, "STRESS memory")
+    _safe_log(log_panel, f"▶️ STRESS: CPU + memory + disk for {duration:.0f}s...")
+
+    result = {"stressors": {}, "score": (0.0, "")}
+    work_dir = tempfile.mkdtemp(dir=directory)
+    stressors = {}
+
+    try:
+        stressors = _stress_bodies(work_dir, memory_mb, file_mb)
+
+        baselines = {}
+        span = isolated / (isolated * len(stressors) + duration)
+        for i, (name, (bodies, _)) in enumerate(stressors.items()):
+            alone = _stress_run({name: (bodies, None)}, isolated, window, f"Stress baseline {name}",
+                                (i * span, span))[name]
+            baselines[name] = _percentile(sorted(alone["throughput"]), 50)
+            _safe_log(log_panel, f"STRESS {name} alone: {baselines[name]:.1f} MB/s")
+
+        combined = _stress_run(stressors, duration, window, "Stress combined",
+                               (span * len(stressors), 1.0 - span * len(stressors)))
+
+    except BenchmarkCancelled:
+        raise
+    except Exception as e:
+        result["score"] = (0.0, f"error: {e}")
+        return result
+
+    finally:
+        for _, cleanup in stressors.values():
+            if cleanup:
+                cleanup()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for name, run in combined.items():
+        series = run["throughput"]
+        baseline = baselines[name]
+        median = _percentile(sorted(series), 50)
+        stalled = sum(1 for value in series if value < baseline * 0.05)
+
+        result["stressors"][name] = {
+            "isolated": round(baseline, 2),
+            "combined": round(median, 2),
+            "ratio": round(median / baseline, 3) if baseline > 0 else 0.0,
+            "min_ratio": round(min(series) / baseline, 3) if baseline > 0 else 0.0,
+            "stalled_windows": stalled,
+            "errors": run["errors"],
+            "error": run["error"],
+            "series": [round(value, 2) for value in series],
+        }
+
+        row = result["stressors"][name]
+        _safe_log(log_panel, f"STRESS {name}: {row['combined']:.1f} MB/s under load vs {row['isolated']:.1f} alone "
+                             f"(x{row['ratio']:.2f}, worst window x{row['min_ratio']:.2f}, "
+                             f"{stalled} stalled, {run['errors']} errors)")
+
+    rows = result["stressors"].values()
+    errors = sum(row["errors"] for row in rows)
+    stalled = sum(row["stalled_windows"] for row in rows)
+    mean_ratio = sum(row["ratio"] for row in rows) / len(rows)
+
+    score = 0.0 if errors else _normalize(mean_ratio, ref_min=0.25, ref_max=1.0)
+    detail = " ".join(f"{name}=x{row['ratio']:.2f}" for name, row in result["stressors"].items())
+    if stalled:
+        detail += f" ⚠️ {stalled} stalled windows"
+    if errors:
+        first = next(row["error"] for row in rows if row["error"])
+        detail += f" ⚠️ {errors} errors ({first})"
+
+    result["score"] = (score, detail)
+    return result
+
+
+# ---------- Machine fingerprint ----------
+def _cpu_model() -> str:
+    if os.name != "nt":
+        try:
+            with open("/proc/cpuinfo") as f:
+                for line in f:
+                    if line.startswith("model name"):
+                        return line.split(":", 1)[1].strip()
+        except OSError:
+            pass
+
+    return platform.processor() or platform.machine()
+
+
+def _total_memory() -> int:
+    """Installed physical memory in bytes (0 if unknown)."""
+    if _HAS_PSUTIL:
+        return psutil.virtual_memory().total
+
+    if os.name == "nt":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        return status.ullTotalPhys
+
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+@functools.lru_cache(maxsize=1)
+def _gpu_driver() -> str:
+    """Display adapter(s) and driver version, so a driver update changes the fingerprint. '' if unknown."""
+    try:
+        if os.name == "nt":
+            proc = subprocess.run(
+                'powershell -Command "Get-CimInstance Win32_VideoController | '
+                'ForEach-Object { $_.Name + \' \' + $_.DriverVersion }"',
+                capture_output=True, text=True, shell=True, timeout=15
+            )
+            return "; ".join(line.strip() for line in proc.stdout.splitlines() if line.strip())
+
+        if os.path.exists("/proc/driver/nvidia/version"):
+            with open("/proc/driver/nvidia/version") as f:
+                return f.readline().strip()
+
+        drivers = []
+        for card in sorted(os.listdir("/sys/class/drm")):
+            link = os.path.join("/sys/class/drm", card, "device", "driver")
+            if card.startswith("card") and "-" not in card and os.path.islink(link):
+                name = os.path.basename(os.readlink(link))
+                version_path = os.path.join("/sys/module", name, "version")
+                if os.path.exists(version_path):
+                    with open(version_path) as f:
+                        name += " " + f.read().strip()
+                drivers.append(name)
+        return "; ".join(drivers)
+
+    except Exception:
+        return ""
+
+
+def machine_fingerprint() -> dict:
+    """
+    Hardware / OS identity used to key history and cached results: CPU, cores, RAM, system disk,
+    OS build and GPU driver.
+    """
+    try:
+        disk_total = shutil.disk_usage(tempfile.gettempdir()).total
+    except OSError:
+        disk_total = 0
+
+    return {
+        "cpu": _cpu_model(),
+        "cores": os.cpu_count() or 1,
+        "ram_mb": _total_memory() // _MB,
+        "disk_gb": disk_total // (1024 * _MB),
+        "os": f"{platform.system()} {platform.release()} ({platform.version()})",
+        "machine": platform.machine(),
+        "gpu": _gpu_driver(),
+    }
+
+
+# ---------- Isolated execution ----------
+def _available_cores() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    if _HAS_PSUTIL:
+        try:
+            return sorted(psutil.Process().cpu_affinity())
+        except Exception:
+            pass
+    return list(range(os.cpu_count() or 1))
+
+
+def _pin_process(cores: list[int] | None, priority: bool) -> list[str]:
+    """
+    Pins the current process to `cores` (sched_setaffinity, else psutil: Windows / BSD) and
+    raises its priority. macOS has no affinity API; it runs unpinned.
+    Returns notes about what could not be applied.
+    """
+    notes = []
+
+    if cores:
+        try:
+            if hasattr(os, "sched_setaffinity"):
+                os.sched_setaffinity(0, cores)
+            elif _HAS_PSUTIL and hasattr(psutil.Process, "cpu_affinity"):
+                psutil.Process().cpu_affinity(list(cores))
+            else:
+                notes.append("affinity not supported")
+        except Exception as e:
+            notes.append(f"affinity failed: {e}")
+
+    if priority:
+        try:
+            if os.name == "nt" and _HAS_PSUTIL:
+                psutil.Process().nice(psutil.HIGH_PRIORITY_CLASS)
+            elif hasattr(os, "nice"):
+                os.nice(-5)  # needs privileges; the benchmark still runs at normal priority without them
+        except Exception as e:
+            notes.append(f"priority not raised: {e}")
+
+    return notes
+
+
+class _PipeLog:
+    """Stand-in log panel inside a worker process: forwards log lines to the parent over the pipe."""
+
+    def __init__(self, send) -> None:
+        self.send = send
+
+    def log(self, msg) -> None:
+        self.send(("log", msg))
+
+
+def _isolated_entry(conn, func, args: tuple, kwargs: dict, cores: list[int] | None, priority: bool,
+                    forward_log: bool) -> None:
+    """Worker process body: pin, run func, send events / log lines / the result back over `conn`."""
+    lock = threading.Lock()
+
+    def send(message) -> None:
+        with lock:  # benchmarks may report from pool threads
+            conn.send(message)
+
+    try:
+        for note in _pin_process(cores, priority):
+            send(("log", f"⚠️ isolated worker: {note}"))
+
+        reporter = ProgressReporter()
+        reporter.begin(0, 1, func.__name__)
+        reporter.callback = lambda event: send(("event", event))
+
+        if forward_log:
+            kwargs["log_panel"] = _PipeLog(send)
+
+        with reporting(reporter):
+            result = func(*args, **kwargs)
+
+        send(("result", result))
+    except BaseException as e:
+        send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_isolated(func, *args, cores: list[int] | None = None, priority: bool = True,
+                 timeout: float | None = None, **kwargs):
+    """
+    Runs func(*args, **kwargs) in a fresh (spawned) worker process pinned to `cores` at raised
+    priority, away from the GUI thread and other actions, and returns its result. `func` and the
+    arguments must be picklable, so pass module-level benchmark functions. A `log_panel` kwarg
+    stays in this process: the worker's log lines and progress events are forwarded to it and
+    to the current reporter. Cancelling the reporter terminates the worker.
+    Raises RuntimeError when the worker fails or dies, TimeoutError after `timeout` seconds.
+    """
+    forward_log = "log_panel" in kwargs
+    log_panel = kwargs.pop("log_panel", None)  # the worker gets a _PipeLog instead
+
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_isolated_entry, args=(sender, func, args, kwargs, cores, priority, forward_log))
+    proc.start()
+    sender.close()
+
+    reporter = _reporter()
+    deadline = time.perf_counter() + timeout if timeout else None
+
+    try:
+        while True:
+            if reporter:
+                reporter.check()
+
+            if deadline and time.perf_counter() > deadline:
+                raise TimeoutError(f"{func.__name__} did not finish in {timeout}s")
+
+            if not receiver.poll(0.1):
+                continue
+
+            try:
+                kind, payload = receiver.recv()
+            except EOFError:
+                proc.join(1.0)
+                raise RuntimeError(f"{func.__name__} worker exited with code {proc.exitcode}")
+
+            if kind == "result":
+                return payload
+            if kind == "error":
+                raise RuntimeError(payload)
+            if kind == "log":
+                _safe_log(log_panel, payload)
+            elif kind == "event" and reporter:
+                reporter.emit(payload["phase"], payload["percent"] / 100.0, payload["value"],
+                              payload["unit"], payload["sample"])
+
+    finally:
+        if proc.is_alive():
+            proc.terminate()
+        proc.join()
+        receiver.close()
+
+
+def _core_throughput(kernel: str, target: float, measure: dict | None) -> float:
+    """Median single-worker throughput of a CPU_SCALING_KERNELS kernel in the calling process."""
+    _, _, _, per_unit, _, _ = CPU_SCALING_KERNELS[kernel]
+    units = _calibrate(lambda u: _cpu_scaling_worker(kernel, u), 1, target, 1, 1_000_000)
+
+    stats = _measure(lambda: units * per_unit / _cpu_scaling_worker(kernel, units),
+                     {"warmup": 1, "min_repeats": 5, "max_repeats": 20, "time_budget": 2.0, **(measure or {})},
+                     "CPU core", CPU_SCALING_KERNELS[kernel][2])
+    return stats["median"]
+
+
+def run_per_core_benchmark(kernel: str = "python", cores: list[int] | None = None, target: float = 0.05,
+                           weak_threshold: float = 0.85, log_panel: None=None,
+                           measure: dict | None = None) -> dict:
+    """
+    Runs the same single-threaded kernel in an isolated worker pinned to each core in turn.
+    Cores more than (1 - weak_threshold) below the median are flagged as weak (throttled, parked,
+    or E-cores on hybrid CPUs). Returns {"cores": [...], "unit", "score": (score, detail)} where
+    the score maps slowest / median (0.5 -> 0, 1.0 -> 10).
+    """
+    cores = cores if cores is not None else _available_cores()
+    _safe_log(log_panel, f"▶️ CPU: per-core '{kernel}' throughput on {len(cores)} cores...")
+
+    result = {"cores": [], "unit": "", "score": (0.0, "")}
+
+    if kernel not in CPU_SCALING_KERNELS or (kernel == "numpy" and not _HAS_NUMPY):
+        result["score"] = (0.0, f"kernel '{kernel}' unavailable")
+        return result
+
+    unit = CPU_SCALING_KERNELS[kernel][2]
+    result["unit"] = unit
+    reporter = _reporter()
+
+    try:
+        for i, core in enumerate(cores):
+            throughput = run_isolated(_core_throughput, kernel, target, measure, cores=[core])
+            result["cores"].append({"core": core, "throughput": round(throughput, 2)})
+
+            if reporter:
+                reporter.emit(f"CPU core {core}", (i + 1) / len(cores), throughput, unit, i + 1)
+            _safe_log(log_panel, f"CPU core {core}: {throughput:.2f} {unit}")
+
+    except BenchmarkCancelled:
+        raise
+    except Exception as e:
+        result["score"] = (0.0, f"error: {e}")
+        return result
+
+    median = _percentile(sorted(row["throughput"] for row in result["cores"]), 50)
+    for row in result["cores"]:
+        row["relative"] = round(row["throughput"] / median, 3) if median else 0.0
+        row["weak"] = row["relative"] < weak_threshold
+
+    slowest = min(result["cores"], key=lambda row: row["throughput"])
+    weak = [str(row["core"]) for row in result["cores"] if row["weak"]]
+
+    score = _normalize(slowest["relative"], ref_min=0.5, ref_max=1.0)
+    detail = (f"median {median:.2f} {unit}, slowest core {slowest['core']} at {slowest['relative']:.0%}"
+              + (f" ⚠️ weak cores: {', '.join(weak)}" if weak else ""))
+    result["score"] = (score, detail)
+    return result
+
+
+# ---------- High-level runner ----------
+# Bump when a benchmark or its scoring changes, so cached results from older code are not reused.
+BENCHMARK_VERSION = 5
+
+# Suite presets. "target" is the calibrated duration of one sample (disk: one sequential pass);
+# the *_mb values cap calibrated sizes. "measure" overrides MEASURE_DEFAULTS.
+# "sustained" is the thermal-throttling run length in seconds (None = skipped);
+# "per_core" adds the pinned per-core throughput scan; "fault_large_mb" sizes the page-fault
+# benchmark's large-buffer first-touch pass (0 = skipped); "fault_pressure" adds its memory-pressure
+# pass, which allocates past the memory budget, up to 90% of the available memory.
+PRESETS = {
+    # ~3.5 s for the whole run_all (single-core VM, software GPU fallback): short samples, few repeats,
+    # QD1/QD32 only, 1 vs N workers
+    "quick": {
+        "target": 0.02,
+        "disk_target": 0.05,
+        "measure": {"warmup": 1, "min_repeats": 3, "max_repeats": 3, "time_budget": 0.1},
+        "gpu_duration": 0.3,
+        "full_scaling": False,
+        "ram_mb": 256,
+        "latency_mb": 64,
+        "disk_mb": 64,
+        "queue_depths": (1, 32),
+        "io_window": 0.02,
+        "commit_budget": 0.15,
+        "spawn_budget": 0.2,
+        "net_duration": 0.1,
+        "fault_large_mb": 0,
+        "fault_pressure": False,
+        "per_core": False,
+        "sustained": None,
+    },
+    "standard": {
+        "target": 0.1,
+        "disk_target": 0.5,
+        "measure": {},
+        "gpu_duration": 5.0,
+        "full_scaling": True,
+        "ram_mb": 1024,
+        "latency_mb": 256,
+        "disk_mb": 500,
+        "queue_depths": QUEUE_DEPTHS,
+        "io_window": 0.25,
+        "commit_budget": 3.0,
+        "spawn_budget": 3.0,
+        "net_duration": 1.0,
+        "fault_large_mb": 512,
+        "fault_pressure": False,
+        "per_core": False,
+        "sustained": None,
+    },
+    # deep diagnostics: long samples, tight CI target, large working sets
+    "thorough": {
+        "target": 0.5,
+        "disk_target": 3.0,
+        "measure": {"min_repeats": 10, "max_repeats": 100, "time_budget": 10.0, "ci_target": 0.01},
+        "gpu_duration": 15.0,
+        "full_scaling": True,
+        "ram_mb": 4096,
+        "latency_mb": 1024,
+        "disk_mb": 4096,
+        "queue_depths": QUEUE_DEPTHS,
+        "io_window": 1.0,
+        "commit_budget": 10.0,
+        "spawn_budget": 10.0,
+        "net_duration": 3.0,
+        "fault_large_mb": 4096,
+        "fault_pressure": True,
+        "per_core": True,
+        "sustained": 60.0,
+    },
+}
+
+
+class PerformanceTester():
+
+    def __init__(self, log_panel=None, gpu_duration: float | None = None, measure: dict | None = None,
+                 disk_targets: list[str] | None = None, disk_concurrent: bool = False,
+                 preset: str = "standard", on_progress=None, network: bool = False,
+                 isolated: bool = False, cores: list[int] | None = None, memory_budget_mb: int | None = None,
+                 trace_allocations: bool = False) -> None:
+        self.log_panel = log_panel
+        # "quick" / "standard" / "thorough", see PRESETS
+        self.preset = PRESETS[preset]
+        self.gpu_duration = gpu_duration or self.preset["gpu_duration"]
+        # overrides for MEASURE_DEFAULTS (warm-up, repeats, time budget, CI target) on top of the preset
+        self.measure = {**self.preset["measure"], **(measure or {})}
+        # directories to benchmark (one per volume); None = temp dir only, [] = every local volume
+        self.disk_targets = disk_targets
+        self.disk_concurrent = disk_concurrent
+        # adds the loopback TCP benchmark as a "Network" sub-score
+        self.network = network
+        # run each benchmark in a fresh worker process pinned to `cores` (None = all) at raised priority
+        self.isolated = isolated
+        self.cores = cores
+        # per-benchmark memory cap in MB (None = MEMORY_BUDGET_FRACTION of available memory); peak RSS
+        # per benchmark is reported under results["Memory"], plus the tracemalloc peak when tracing
+        self.memory_budget_mb = memory_budget_mb
+        self.trace_allocations = trace_allocations
+        self.memory_report = {}
+        # on_progress(event) receives ProgressReporter events while a run is going
+        self.on_progress = on_progress
+        self.reporter = None
+
+    def _log(self, msg) -> None:
+        if self.log_panel:
+            _safe_log(self.log_panel, msg)
+        else:
+            print(msg)
+
+    def settings(self) -> dict:
+        """Everything besides the machine that changes the results; part of the result cache key."""
+        return {
+            "version": BENCHMARK_VERSION,
+            "preset": self.preset,
+            "measure": self.measure,
+            "gpu_duration": self.gpu_duration,
+            "disk_targets": self.disk_targets,
+            "disk_concurrent": self.disk_concurrent,
+            "network": self.network,
+            "isolated": self.isolated,
+            "cores": self.cores,
+            "memory_budget_mb": self.memory_budget_mb,
+            "trace_allocations": self.trace_allocations,
+        }
+
+    def _call(self, func, *args, **kwargs):
+        """
+        Runs one benchmark in-process, or in a pinned worker process (run_isolated) when isolated,
+        within the memory budget; its memory figures go to memory_report under the function name.
+        """
+        instrumented = (self.memory_budget_mb, self.trace_allocations, func) + args
+
+        if not self.isolated:
+            result, memory = _instrumented(*instrumented, **kwargs)
+        else:
+            try:
+                result, memory = run_isolated(_instrumented, *instrumented, cores=self.cores, **kwargs)
+            except (RuntimeError, OSError) as e:
+                self._log(f"⚠️ Isolated run of {func.__name__} failed ({e}), running it in-process")
+                result, memory = _instrumented(*instrumented, **kwargs)
+
+        self.memory_report[func.__name__] = memory
+        if memory["within_budget"] is False:
+            self._log(f"⚠️ {func.__name__} grew RSS by {memory['rss_growth_mb']} MB, "
+                      f"over its {memory['budget_mb']} MB memory budget")
+        return result
+
+    def cancel(self) -> None:
+        """Stops the current run at the next sample; run_all_internal returns the partial results."""
+        if self.reporter:
+            self.reporter.cancel()
+
+    def run_all(self, async_run: bool = False):
+        """
+        Runs CPU, RAM, Disk, GPU. If async_run True => runs in a background thread and returns immediately.
+        Otherwise, blocks and returns a results dict.
+        """
+
+        if async_run:
+            thread = threading.Thread(target=self.run_all_internal, daemon=True)
+            thread.start()
+            print(thread)
+            return thread
+
+        else:
+            return self.run_all_internal()
+
+    def iter_events(self):
+        """
+        Runs the suite in a background thread and yields its progress events as they arrive.
+        The last event has phase "done" and carries the results dict under "results"; if the run
+        raises, the generator re-raises that error instead. Closing the generator early (e.g. `break`)
+        cancels the run.
+        """
+        events = queue.Queue()
+        reporter = ProgressReporter(events.put)
+
+        def worker() -> None:
+            done = {"benchmark": "", "phase": "done", "percent": 100.0, "value": None,
+                    "unit": "", "sample": 0, "results": None}
+            try:
+                done["results"] = self.run_all_internal(reporter)
+            except BaseException as e:
+                done["error"] = e
+            finally:
+                # always terminate the stream, or the consumer would block on events.get() forever
+                events.put(done)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+        try:
+            while True:
+                event = events.get()
+
+                if event["phase"] != "done":
+                    yield event
+                elif "results" in event:
+                    if "error" in event:
+                        raise event["error"]
+                    yield event
+                    return
+                # else: the suite's own "done" progress event; the worker's, with the results, follows
+        finally:
+            reporter.cancel()
+
+    def run_stress(self, duration: float = 120.0, directory: str | None = None) -> dict:
+        """
+        Blocking whole-system stress run (see run_stress_test). Reports progress to on_progress
+        and stops early on cancel(), returning {"Cancelled": True}.
+        """
+        self.reporter = ProgressReporter(self.on_progress)
+        self.reporter.begin(0, 1, "Stress")
+
+        with reporting(self.reporter):
+            try:
+                result = run_stress_test(duration, directory=directory, log_panel=self.log_panel)
+            except BenchmarkCancelled:
+                self._log("⏹ Stress test cancelled.")
+                return {"Cancelled": True}
+
+        self._log(f"🔥 Stress Score: {result['score'][0]}/10 — {result['score'][1]}")
+        return result
+
+    def run_all_internal(self, reporter: ProgressReporter | None = None) -> dict:
+        self.reporter = reporter or ProgressReporter(self.on_progress)
+        self.memory_report = {}
+        results = {}
+
+        with reporting(self.reporter):
+            try:
+                self._run_suite(self.reporter, results)
+            except BenchmarkCancelled:
+                self._log("⏹ Benchmark cancelled.")
+                results["Final"] = None
+                results["Cancelled"] = True
+
+        # per-benchmark declared / measured memory; not a (score, detail) tuple, so history skips it
+        results["Memory"] = self.memory_report
+        peaks = [m["peak_rss_mb"] for m in self.memory_report.values() if m["peak_rss_mb"] is not None]
+        if peaks:
+            budget = (f"{self.memory_budget_mb} MB" if self.memory_budget_mb
+                      else f"{MEMORY_BUDGET_FRACTION:.0%} of available memory")
+            self._log(f"🧮 Peak RSS: {max(peaks)} MB (budget per benchmark: {budget})")
+
+        return results
+
+    def _run_suite(self, reporter: ProgressReporter, results: dict) -> None:
+        """Runs every benchmark in order, filling `results` as each one finishes."""
+        self._log("▶️ Starting full hardware benchmark suite...")
+        preset = self.preset
+        target = preset["target"]
+        steps = 10 + bool(self.network) + bool(preset["per_core"]) + bool(preset["sustained"])
+
+        # CPU
+        reporter.begin(0, steps, "CPU")
+        cpu_score, cpu_detail = self._call(run_cpu_benchmark, log_panel=self.log_panel, measure=self.measure, target=target)
+        results["CPU"] = (cpu_score, cpu_detail)
+        self._log(f"🖥 CPU Score: {cpu_score}/10  — {cpu_detail}")
+
+        # CPU single-core / all-core
+        reporter.begin(1, steps, "CPU scaling")
+        cores = os.cpu_count() or 1
+        scaling = self._call(run_cpu_scaling_benchmark, log_panel=self.log_panel, measure=self.measure, target=target,
+                             worker_counts=None if preset["full_scaling"] else sorted({1, cores}))
+        single_score, single_detail = scaling["single_core"]
+        multi_score, multi_detail = scaling["all_core"]
+        results["CPU Single-core"] = (single_score, single_detail)
+        results["CPU All-core"] = (multi_score, multi_detail)
+        self._log(f"🖥 CPU Single-core Score: {single_score}/10 — {single_detail}")
+        self._log(f"🖥 CPU All-core Score: {multi_score}/10 — {multi_detail}")
+
+        # RAM
+        reporter.begin(2, steps, "RAM")
+        ram_score, ram_detail = self._call(run_ram_benchmark, preset["ram_mb"], log_panel=self.log_panel,
+                                           measure=self.measure, target=target)
+        results["RAM"] = (ram_score, ram_detail)
+        self._log(f"💾 RAM Score: {ram_score}/10 — {ram_detail}")
+
+        # RAM latency
+        reporter.begin(3, steps, "RAM latency")
+        lat_score, lat_detail = self._call(run_ram_latency_benchmark, preset["latency_mb"], log_panel=self.log_panel,
+                                           measure=self.measure, target=target)
+        results["RAM Latency"] = (lat_score, lat_detail)
+        self._log(f"💾 RAM Latency Score: {lat_score}/10 — {lat_detail}")
+
+        # Disk
+        reporter.begin(4, steps, "Disk")
+        volumes = {}
+        disk_opts = {"size_mb": preset["disk_mb"], "log_panel": self.log_panel, "measure": self.measure,
+                     "target": preset["disk_target"], "queue_depths": preset["queue_depths"],
+                     "io_window": preset["io_window"]}
+
+        if self.disk_targets is None:
+            disk_score, disk_detail = self._call(run_disk_benchmark, **disk_opts)
+        else:
+            volumes = self._call(run_disk_suite, self.disk_targets or None, concurrent=self.disk_concurrent, **disk_opts)
+            # the slowest volume drives the Disk score, so a fast system drive can't hide a slow data disk;
+            # targets that could not be tested at all are reported, not scored, unless none worked
+            measured = [target for target in volumes if not volumes[target][1].startswith("error:")] or list(volumes)
+            if measured:
+                slowest = min(measured, key=lambda target: volumes[target][0])
+                disk_score, disk_detail = volumes[slowest][0], f"[{slowest}] {volumes[slowest][1]}"
+            else:
+                disk_score, disk_detail = 0.0, "error: no writable disk target"
+
+        results["Disk"] = (disk_score, disk_detail)
+        self._log(f"🗄 Disk Score: {disk_score}/10 — {disk_detail}")
+
+        # Disk commit (fsync) latency
+        reporter.begin(5, steps, "Disk commit latency")
+        commit_score, commit_detail = self._call(run_commit_latency_benchmark, time_budget=preset["commit_budget"],
+                                                 log_panel=self.log_panel)
+        results["Disk Commit Latency"] = (commit_score, commit_detail)
+        results.update({f"Disk [{target}]": result for target, result in volumes.items()})
+        self._log(f"🗄 Disk Commit Latency Score: {commit_score}/10 — {commit_detail}")
+
+        # GPU
+        reporter.begin(6, steps, "GPU")
+        gpu_score, gpu_detail = self._call(run_gpu_benchmark, duration= self.gpu_duration, log_panel=self.log_panel, measure=self.measure)
+        results["GPU"] = (gpu_score, gpu_detail)
+        # no usable OpenGL context: the GPU slot holds the CPU-rendered score instead of a GPU score
+        results["GPU Fallback"] = gpu_detail.startswith(_SOFTWARE_GPU_TAG)
+        self._log(f"🎮 GPU Score: {gpu_score}/10 — {gpu_detail}")
+
+        # Application workloads
+        reporter.begin(7, steps, "Application")
+        app = self._call(run_workload_benchmark, log_panel=self.log_panel, measure=self.measure, target=target)
+        app_score, app_detail = app["score"]
+        results["Application"] = (app_score, app_detail)
+        self._log(f"📦 Application Responsiveness Score: {app_score}/10 — {app_detail}")
+
+        # Process spawn latency (reported, not weighted): antivirus / endpoint agent overhead
+        reporter.begin(8, steps, "Process spawn")
+        spawn = self._call(run_spawn_benchmark, time_budget=preset["spawn_budget"], log_panel=self.log_panel)
+        results["Process Spawn"] = spawn["score"]
+        self._log(f"🚀 Process Spawn Score: {spawn['score'][0]}/10 — {spawn['score'][1]}")
+
+        # Allocation / page-fault cost (reported, not weighted)
+        reporter.begin(9, steps, "RAM page faults")
+        faults = self._call(run_page_fault_benchmark, preset["latency_mb"], large_mb=preset["fault_large_mb"],
+                            pressure=preset["fault_pressure"],
+                            log_panel=self.log_panel, measure=self.measure)
+        results["RAM Page Faults"] = faults["score"]
+        self._log(f"💾 RAM Page Fault Score: {faults['score'][0]}/10 — {faults['score'][1]}")
+
+        # Loopback network (optional, reported, not weighted)
+        if self.network:
+            reporter.begin(10, steps, "Network")
+            net = self._call(run_network_benchmark, duration=preset["net_duration"], log_panel=self.log_panel)
+            results["Network"] = net["score"]
+            self._log(f"🌐 Network Score: {net['score'][0]}/10 — {net['score'][1]}")
+
+        # Per-core throughput (reported, not weighted): finds weak or throttled cores
+        if preset["per_core"]:
+            reporter.begin(steps - 1 - bool(preset["sustained"]), steps, "CPU per-core")
+            per_core = run_per_core_benchmark(cores=self.cores, log_panel=self.log_panel, measure=self.measure)
+            results["CPU Per-core"] = per_core["score"]
+            self._log(f"🖥 CPU Per-core Score: {per_core['score'][0]}/10 — {per_core['score'][1]}")
+
+        # Sustained load runs last so its heat doesn't skew the other benchmarks; reported, not weighted
+        if preset["sustained"]:
+            reporter.begin(steps - 1, steps, "CPU sustained")
+            thermal = self._call(run_thermal_benchmark, preset["sustained"], log_panel=self.log_panel)
+            results["CPU Sustained"] = thermal["score"]
+            self._log(f"🌡 CPU Sustained Score: {thermal['score'][0]}/10 — {thermal['score'][1]}")
+
+        # Final weighted score
+        # Weights: CPU 30% (matmul, single-core, all-core, application workloads 7.5% each),
+        # RAM 20% (bandwidth 10%, latency 10%), Disk 20% (throughput/IOPS 15%, commit latency 5%), GPU 30%
+        cpu_total = (cpu_score + single_score + multi_score + app_score) / 4
+        ram_total = (ram_score + lat_score) / 2
+        disk_total = disk_score * 0.75 + commit_score * 0.25
+        final = round(cpu_total * 0.30 + ram_total * 0.20 + disk_total * 0.20 + gpu_score * 0.30, 2)
+        results["Final"] = final
+        reporter.emit("done", 1.0)
+        note = " (GPU 30% from software graphics fallback)" if results["GPU Fallback"] else ""
+        self._log(f"🏆 Final Score: {final}/10{note}")
+
+
+def export_results(results: dict, fingerprint: dict | None = None, settings: dict | None = None) -> dict:
+    """
+    JSON-ready document for one run: (score, detail) tuples become {"score", "detail"} objects.
+    This is the per-machine file format fleet_aggregator.py reads.
+    """
+    return {
+        "version": BENCHMARK_VERSION,
+        "timestamp": time.time(),
+        "fingerprint": fingerprint or machine_fingerprint(),
+        "settings": settings,
+        "results": {metric: {"score": value[0], "detail": value[1]} if isinstance(value, tuple) else value
+                    for metric, value in results.items()},
+    }
+
+
+# If run directly
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Hardware benchmark suite")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="standard")
+    parser.add_argument("--network", action="store_true", help="add the loopback TCP sub-score")
+    parser.add_argument("--isolated", action="store_true", help="run each benchmark in a pinned worker process")
+    parser.add_argument("--memory-budget", type=int, metavar="MB", help="per-benchmark memory cap in MB")
+    parser.add_argument("--trace-allocations", action="store_true",
+                        help="report tracemalloc peaks (slows the Python-heavy benchmarks)")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON to PATH ('-' = stdout)")
+    args = parser.parse_args()
+
+    tester = PerformanceTester(preset=args.preset, network=args.network, isolated=args.isolated,
+                               memory_budget_mb=args.memory_budget, trace_allocations=args.trace_allocations)
+
+    if not args.json:
+        res = tester.run_all()
+        print(res)
+    else:
+        # keep stdout clean for the JSON document: progress lines go to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            res = tester.run_all()
+
+        document = json.dumps(export_results(res, settings=tester.settings()), indent=2, default=str)
+
+        if args.json == "-":
+            print(document)
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                f.write(document)
@@ -2,10 +2,13 @@
 import shutil
 import webbrowser
 import os
+import re
 import subprocess
 import threading
 from datetime import datetime
 from performance_tester import PerformanceTester
+from benchmark_history import BenchmarkHistory, ResultCache
+from optimization_ab import DEFAULT_AB_BENCHMARKS, ab_report, run_ab_test
 
 
 SERVICE_INFO = {
@@ -66,6 +69,30 @@ class SystemActions:
     def __init__(self, log_panel=None) -> None:
         self.log_panel = log_panel
         self.bench = PerformanceTester(log_panel)
+        # SQLite stores are opened on first use (inside the callers' try blocks), so a profile
+        # directory that can't be written doesn't stop the app from starting
+        self._history = None
+        self._result_cache = None
+
+    @property
+    def history(self) -> BenchmarkHistory:
+        if self._history is None:
+            self._history = BenchmarkHistory()
+        return self._history
+
+    @property
+    def result_cache(self) -> ResultCache:
+        if self._result_cache is None:
+            # repeat tests within the TTL (seconds) reuse the last results unless force_refresh is set
+            self._result_cache = ResultCache(ttl=3600)
+        return self._result_cache
+
+    def _invalidate_results(self) -> None:
+        """Drops cached benchmark results after an action that changes performance but not the fingerprint."""
+        try:
+            self.result_cache.clear()
+        except Exception as e:
+            self._log("error", f"[{_timestamp()}] Could not clear benchmark cache: {e}")
 
 
     def _log (self, level: str, msg: str) -> None:
@@ -136,6 +163,8 @@ class SystemActions:
 
                 success = proc.returncode == 0
                 stderr = proc.stderr.strip()
+                if success:
+                    self._invalidate_results()
 
                 if on_finish:
                     try:
@@ -174,8 +203,43 @@ class SystemActions:
         self.log_panel.success("Restore point created successfully!")
 
     @auto_log
-    def pc_performance_test(self):
-        self.bench.run_all(async_run=True)
+    def pc_performance_test(self, on_progress=None, force_refresh: bool = False) -> dict:
+        """
+        Blocking run (call from a worker thread); on_progress receives live benchmark events.
+        Returns cached results (marked "Cached") when this machine ran the same test within the cache TTL.
+        """
+        settings = self.bench.settings()
+
+        if not force_refresh:
+            try:
+                cached = self.result_cache.get(settings)
+            except Exception as e:
+                cached = None
+                self._log("error", f"[{_timestamp()}] Could not read benchmark cache: {e}")
+
+            if cached:
+                self._log("info", f"[{_timestamp()}] ♻️ Using results from {cached['Cached'] / 60:.0f} min ago "
+                                  f"— Final Score: {cached.get('Final')}/10")
+                return cached
+
+        self.bench.on_progress = on_progress
+        results = self.bench.run_all()
+
+        if results and not results.get("Cancelled"):
+            try:
+                self.result_cache.put(results, settings)
+            except Exception as e:
+                self._log("error", f"[{_timestamp()}] Could not cache benchmark results: {e}")
+
+            try:
+                run_id = self.history.record(results, settings=settings)
+                for reg in self.history.detect_regressions(run_id):
+                    self._log("warning", f"[{_timestamp()}] {reg['metric']} regressed {reg['drop_pct']}% "
+                                         f"({reg['score']:.2f} vs baseline {reg['baseline']:.2f})")
+            except Exception as e:
+                self._log("error", f"[{_timestamp()}] Could not save benchmark history: {e}")
+
+        return results
 
     @auto_log
     def clean_temporary_files(self) -> None:
@@ -333,6 +397,7 @@ class SystemActions:
         result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
         if result.returncode != 0:
             raise RuntimeError(result.stderr.strip())
+        self._invalidate_results()
 
     @auto_log
     def disable_background_apps(self) -> None:
@@ -343,11 +408,96 @@ class SystemActions:
         result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
         if result.returncode != 0:
             raise RuntimeError(result.stderr.strip())
+        self._invalidate_results()
+
+    # State queries / reverts used by the A/B harness to undo an optimization
+    def get_active_power_plan(self) -> str:
+        """GUID of the active power plan, '' on error."""
+        proc = subprocess.run("powercfg /getactivescheme", shell=True, capture_output=True, text=True)
+        match = re.search(r"[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}", proc.stdout)
+        return match.group(0) if match else ""
+
+    def set_power_plan(self, guid: str) -> None:
+        result = subprocess.run(f'powershell -Command "powercfg -setactive {guid}"',
+                                shell=True, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+
+    def background_apps_disabled(self) -> bool:
+        proc = subprocess.run(
+            'powershell -Command "(Get-ItemProperty HKCU:\\Software\\Microsoft\\Windows\\CurrentVersion\\'
+            'BackgroundAccessApplications).GlobalUserDisabled"',
+            shell=True, capture_output=True, text=True
+        )
+        return proc.stdout.strip() == "1"
+
+    def enable_background_apps(self) -> None:
+        cmd = (
+            'powershell -Command "Set-ItemProperty HKCU:\\Software\\Microsoft\\Windows\\CurrentVersion\\'
+            'BackgroundAccessApplications GlobalUserDisabled 0"'
+        )
+        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+
+    def get_service_start_type(self, service_name: str) -> str:
+        """sc.exe start type: 'auto', 'delayed-auto', 'demand', 'disabled', 'boot' or 'system'; '' on error."""
+        proc = subprocess.run(f"sc.exe qc {service_name}", shell=True, capture_output=True, text=True)
+        match = re.search(r"START_TYPE\s*:\s*\d+\s+(\w+)(\s+\(DELAYED\))?", proc.stdout)
+        if not match:
+            return ""
+
+        start = {"AUTO_START": "auto", "DEMAND_START": "demand", "DISABLED": "disabled",
+                 "BOOT_START": "boot", "SYSTEM_START": "system"}.get(match.group(1), "")
+        return "delayed-auto" if start == "auto" and match.group(2) else start
+
+    def restore_service(self, service_name: str, start_type: str, status: str) -> None:
+        """Puts back a get_service_start_type start type, then starts the service if `status` was 'running'."""
+        result = subprocess.run(f"sc.exe config {service_name} start= {start_type}",
+                                shell=True, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or result.stdout.strip())
+
+        if status == "running":
+            result = subprocess.run(f'powershell -Command "Start-Service {service_name}"',
+                                    shell=True, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip())
+
+    def set_service_state(self, service_name: str, action: str) -> None:
+        """Blocking toggle_service_async: waits for the worker and raises if the command failed."""
+        outcome = {}
+        thread = self.toggle_service_async(
+            service_name, action,
+            on_finish=lambda success, stderr: outcome.update(success=success, error=stderr),
+            on_error=lambda e: outcome.update(success=False, error=str(e))
+        )
+        thread.join()
+
+        if not outcome.get("success"):
+            raise RuntimeError(outcome.get("error") or f"Could not {action} {service_name}")
+
+    @auto_log
+    def optimization_ab_test(self, action: str, benchmarks=None, rounds: int = 6, settle: float = 10.0,
+                             revert: bool = True, preset: str = "standard", on_progress=None) -> dict:
+        """
+        Blocking A/B test of one optimization (see optimization_ab.AB_ACTIONS); logs a per-metric
+        before/after table and returns the full result.
+        """
+        result = run_ab_test(self, action, benchmarks=benchmarks or DEFAULT_AB_BENCHMARKS, rounds=rounds,
+                             settle=settle, revert=revert, preset=preset, log_panel=self.log_panel,
+                             on_progress=on_progress)
+
+        for line in ab_report(result).splitlines():
+            self._log("info", line)
+
+        return result
 
     @auto_log
     def complete_optimization(self) -> None:
         self.log_panel.info("Running complete optimization…")
         # TODO: implementar otimizações reais
+        self._invalidate_results()
 
     @auto_log
     def update_software(self) -> None: